@@ -0,0 +1,169 @@
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from dataclasses import replace
+from typing import List, Tuple
+from urllib.parse import quote_plus
+import asyncio
+import time
+
+from .scraper import GoogleMapsScraper
+from .network import block_lean_urls
+from .helpers import print_colored
+from .const.colors import Colors
+from .const.settings import SELECTORS, SCRAPER_CONFIG, Business
+from .const.scripts import SCROLL_FEED
+
+class AsyncGoogleMapsScraper:
+    """Scrape several queries concurrently in separate tabs of one browser.
+    
+    WebDriver only talks to one tab at a time, so every command runs under a
+    lock after switching to its tab. Everything slow (page loads, lazy loading
+    after a scroll, opening the reviews pane) is started with a non-blocking
+    command and then awaited by polling, which lets other tabs run meanwhile.
+    Page loads and review panes are paced by the shared rate controller,
+    like those of the sync engine.
+    """
+    
+    def __init__(self, driver: webdriver.Chrome, tabs: int = 4):
+        self.driver = driver
+        self.tabs = tabs
+        self.scraper = GoogleMapsScraper(driver)
+        self.rate = self.scraper.rate
+        self.lock = asyncio.Lock()
+        self.failed: List[Tuple[str, str]] = []  # (query, error) of queries that used up their retries
+    
+    async def _run(self, handle: str, func):
+        """Run a blocking WebDriver call against the given tab."""
+        async with self.lock:
+            if self.driver.current_window_handle != handle:
+                self.driver.switch_to.window(handle)
+            return func()
+    
+    async def _poll(self, handle: str, func, timeout: float):
+        """Poll func in a tab until it returns a truthy value or timeout passes."""
+        deadline = time.monotonic() + timeout
+        while True:
+            result = await self._run(handle, func)
+            if result or time.monotonic() >= deadline:
+                return result
+            await asyncio.sleep(SCRAPER_CONFIG['async_poll_interval'])
+    
+    async def search(self, handle: str, query: str) -> None:
+        """Start navigation to the results page and wait for the feed."""
+        url = f'{SCRAPER_CONFIG["maps_url"]}/search/{quote_plus(query)}'
+        async with self.rate.request_async():
+            await self._run(handle, lambda: self.driver.execute_script('window.location.href = arguments[0];', url))
+            
+            feed = await self._poll(
+                handle,
+                lambda: self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['business_list']),
+                SCRAPER_CONFIG['page_load_timeout']
+            )
+            if not feed:
+                # Maps redirects to a captcha page when it throttles a client
+                if '/sorry/' in await self._run(handle, lambda: self.driver.current_url):
+                    self.rate.throttled()
+                    raise Exception(f'Search blocked by a captcha page: {query}')
+                raise Exception(f'Search operation timed out: {query}')
+    
+    async def scroll_results(self, handle: str, max_results: int) -> None:
+        """Scroll until max_results cards are loaded or the list stops growing."""
+        last_count = -1
+        while True:
+            state = await self._run(handle, lambda: self.driver.execute_script(SCROLL_FEED, SELECTORS))
+            if not state or state['count'] >= max_results or state['ended']:
+                return
+            
+            # Let other tabs work while this one loads more cards
+            previous = state['count']
+            grown = await self._poll(
+                handle,
+                lambda: self.driver.execute_script(SCROLL_FEED, SELECTORS)['count'] > previous,
+                SCRAPER_CONFIG['scroll_timeout']
+            )
+            if not grown or previous == last_count:
+                return
+            last_count = previous
+    
+    async def get_reviews(self, handle: str, card) -> list:
+        """Open a card's reviews pane and extract its reviews once loaded."""
+        try:
+            async with self.rate.request_async():
+                await self._run(handle, lambda: card.find_element(By.CSS_SELECTOR, SELECTORS['reviews_tab']).click())
+                elements = await self._poll(
+                    handle,
+                    lambda: card.find_elements(By.CSS_SELECTOR, SELECTORS['review_items']),
+                    SCRAPER_CONFIG['review_scroll_timeout']
+                )
+            return await self._run(handle, lambda: [self.scraper._extract_review(e) for e in elements])
+        except Exception as e:
+            print(f'Error getting reviews: {str(e)}')
+            return []
+    
+    async def scrape_in_tab(self, handle: str, query: str, max_results: int) -> List[Business]:
+        """Scrape a single query in an already open tab."""
+        await self.search(handle, query)
+        await self.scroll_results(handle, max_results)
+        
+        cards = await self._run(handle, lambda: self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['business_cards']))
+        extracted = await self._run(handle, lambda: self.scraper._extract_cards_bulk(len(cards)))
+        
+        businesses = []
+        for index, card in enumerate(cards[:max_results]):
+            business = extracted[index] or await self._run(handle, lambda: self.scraper.extract_business_data(card))
+            businesses.append(replace(business, reviews=await self.get_reviews(handle, card)))
+            
+        return businesses
+    
+    async def scrape_queries(self, queries: List[str], max_results: int) -> List[Business]:
+        """Scrape all queries, spreading them over a fixed set of tabs."""
+        pending = asyncio.Queue()
+        for query in queries:
+            pending.put_nowait(query)
+        
+        # Consent cookies are shared by every tab, so accept them once
+        self.driver.get(SCRAPER_CONFIG['maps_url'])
+        self.scraper.accept_consent()
+        
+        main_handle = self.driver.current_window_handle
+        handles = []
+        for _ in range(min(self.tabs, len(queries))):
+            self.driver.switch_to.new_window('tab')
+            if SCRAPER_CONFIG['lean']:
+                block_lean_urls(self.driver)
+            handles.append(self.driver.current_window_handle)
+        
+        businesses = []
+        
+        async def tab_worker(handle: str) -> None:
+            while not pending.empty():
+                query = pending.get_nowait()
+                for attempt in range(1, SCRAPER_CONFIG['max_retries'] + 1):
+                    try:
+                        results = await self.scrape_in_tab(handle, query, max_results)
+                        businesses.extend(results)
+                        print(f'{query}: {len(results)} businesses')
+                        break
+                    except Exception as e:
+                        if attempt == SCRAPER_CONFIG['max_retries']:
+                            self.failed.append((query, str(e)))
+                            print_colored(f'{query} failed after {attempt} attempts: {str(e)}', Colors.YELLOW)
+                            break
+                        # Other tabs keep working while this one backs off
+                        delay = self.rate.backoff(attempt)
+                        print(f'Retry {attempt} for {query} in {delay:.1f}s: {str(e)}')
+                        await asyncio.sleep(delay)
+        
+        try:
+            await asyncio.gather(*(tab_worker(handle) for handle in handles))
+        finally:
+            for handle in handles:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(main_handle)
+            
+        return businesses
+    
+    def scrape_businesses(self, query: str, max_results: int = 20) -> List[Business]:
+        """Synchronous entry point matching GoogleMapsScraper.scrape_businesses."""
+        return asyncio.run(self.scrape_queries([query], max_results))
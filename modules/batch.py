@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from itertools import product
+from typing import Callable, List, Optional, Tuple
+import queue
+import threading
+import time
+
+from .pool import DriverPool
+from .cache import BusinessCache
+from .checkpoint import Checkpoint
+from .profiler import Profiler
+from .dedup import DedupIndex
+from .helpers import print_colored
+from .const.colors import Colors
+from .const.settings import Business
+
+@dataclass
+class WorkerStats:
+    worker_id: int
+    queries: int = 0
+    failed: int = 0
+    businesses: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Businesses scraped per minute of busy time."""
+        if not self.elapsed:
+            return 0.0
+        return self.businesses / self.elapsed * 60
+
+def read_queries(path: str) -> List[str]:
+    """Read one query per line, skipping blank lines and # comments."""
+    with open(path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith('#')]
+
+def build_queries(locations: List[str], business_types: List[str]) -> List[str]:
+    """Build the cartesian product of locations and business types."""
+    return [f'{location} {business_type}' for location, business_type in product(locations, business_types)]
+
+def run_batch(queries: List[str], max_results: int, workers: int,
+              pool: DriverPool,
+              cache: Optional[BusinessCache] = None,
+              incremental: bool = False,
+              checkpoint: Optional[Checkpoint] = None,
+              profiler: Optional[Profiler] = None,
+              dedup: Optional[DedupIndex] = None,
+              sink: Optional[Callable[[Business], None]] = None) -> Tuple[List[Business], List[WorkerStats]]:
+    """Scrape queries over a pool of worker threads sharing a driver pool.
+    
+    Each query borrows a warm driver from the pool; a driver that crashes
+    mid-query is replaced before the scraper retries. With a sink, each
+    business is passed on as soon as it is scraped instead of being
+    collected, and the returned list is empty.
+    """
+    businesses = []
+    lock = threading.Lock()
+    
+    def emit(business: Business) -> None:
+        if sink:
+            sink(business)
+        else:
+            with lock:
+                businesses.append(business)
+    
+    pending = queue.Queue()
+    for query in queries:
+        # Queries finished in a previous run need no driver at all
+        if checkpoint and checkpoint.is_query_done(query):
+            for business in checkpoint.businesses_for(query).values():
+                emit(business)
+        else:
+            pending.put(query)
+    
+    stats = [WorkerStats(worker_id=i) for i in range(min(workers, pending.qsize()))]
+    
+    def worker(worker_stats: WorkerStats) -> None:
+        while True:
+            try:
+                query = pending.get_nowait()
+            except queue.Empty:
+                break
+            
+            start = time.perf_counter()
+            try:
+                with pool.scraper(cache, incremental, checkpoint, profiler, dedup) as scraper:
+                    found = 0
+                    for business in scraper.iter_businesses(query, max_results):
+                        emit(business)
+                        found += 1
+                        worker_stats.businesses += 1
+                print_colored(f'[worker {worker_stats.worker_id}] {query}: {found} businesses', Colors.BLUE)
+            except Exception as e:
+                worker_stats.failed += 1
+                print_colored(f'[worker {worker_stats.worker_id}] {query} failed: {str(e)}', Colors.YELLOW)
+            finally:
+                worker_stats.queries += 1
+                worker_stats.elapsed += time.perf_counter() - start
+    
+    threads = [threading.Thread(target=worker, args=(s,), daemon=True) for s in stats]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    return businesses, stats
+
+def print_worker_stats(stats: List[WorkerStats]) -> None:
+    """Print per-worker throughput at the end of a batch run."""
+    print_colored('Worker throughput:', Colors.CYAN)
+    for s in stats:
+        print_colored(
+            f'  worker {s.worker_id}: {s.queries} queries ({s.failed} failed), '
+            f'{s.businesses} businesses in {s.elapsed:.1f}s ({s.throughput:.1f}/min)',
+            Colors.CYAN
+        )
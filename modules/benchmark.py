@@ -0,0 +1,368 @@
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from dataclasses import replace
+from datetime import date
+from typing import Callable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+import argparse
+import gc
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from .scraper import GoogleMapsScraper
+from .profiler import Profiler
+from .workbook import create_workbook
+from .exporters import EXPORTERS, create_exporter
+from .reviewstore import ReviewStore
+from .harvester import ReviewHarvester
+from .normalize import normalize_businesses
+from .run import setup_driver
+from .helpers import (
+    print_colored,
+    clean_phone_number,
+    format_review_points,
+    parse_time_posted,
+    truncate_text,
+    validate_rating
+)
+from .const.colors import Colors
+from .const.settings import SELECTORS, SCRAPER_CONFIG, Business, Review
+from .const.scripts import CARD_LINKS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+RESULTS_DIR = os.path.join(os.path.dirname(FIXTURES_DIR), 'results')
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve maps.html for every /maps URL, with the fixture parameters filled in."""
+
+    fixture_query = ''
+
+    def do_GET(self) -> None:
+        if not self.path.startswith('/maps'):
+            return super().do_GET()
+
+        with open(os.path.join(FIXTURES_DIR, 'maps.html'), encoding='utf-8') as f:
+            page = f.read().replace("const FIXTURE_QUERY = '';", f"const FIXTURE_QUERY = '{self.fixture_query}';")
+        body = page.encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+def serve_fixtures(params: dict) -> Tuple[ThreadingHTTPServer, str]:
+    """Start a local fixture server and return it with its maps URL."""
+    handler = type('Handler', (FixtureHandler,), {'fixture_query': urlencode(params)})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), lambda *a: handler(*a, directory=FIXTURES_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/maps'
+
+# tracemalloc slows allocation-heavy stages several times over, so peak
+# memory is only traced when asked for
+TRACE_MEMORY = False
+
+def measure(name: str, results: dict, profiler: Optional[Profiler], func: Callable):
+    """Run func and record wall time, WebDriver commands and peak Python memory."""
+    commands = profiler.total_calls if profiler else 0
+    if TRACE_MEMORY:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        return func()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = None
+        if TRACE_MEMORY:
+            peak = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            tracemalloc.stop()
+        results[name] = {
+            'seconds': round(elapsed, 4),
+            'webdriver_calls': (profiler.total_calls - commands) if profiler else 0,
+            'peak_memory_kb': peak
+        }
+        print_colored(
+            f'{name:<28} {elapsed:8.3f}s {results[name]["webdriver_calls"]:7d} calls'
+            + (f' {peak:10.1f} KB' if peak is not None else ''),
+            Colors.CYAN
+        )
+
+def synthetic_businesses(review_count: int, reviews_per_business: int = 20) -> List[Business]:
+    """Generate businesses carrying review_count reviews in total."""
+    return list(iter_synthetic_businesses(review_count, reviews_per_business))
+
+def iter_synthetic_businesses(review_count: int, reviews_per_business: int = 20) -> Iterator[Business]:
+    for index in range((review_count + reviews_per_business - 1) // reviews_per_business):
+        count = min(reviews_per_business, review_count - index * reviews_per_business)
+        yield Business(
+            name=f'Business {index}',
+            street_address=f'Hauptstraße {index + 1}',
+            postal_code='91522',
+            city='Ansbach',
+            phone=f'+49981{1000 + index}',
+            website=f'https://business-{index}.example',
+            avg_rating=4.5,
+            num_ratings=count,
+            reviews=[Review(
+                text=f'Review {i} for business {index}: quick response and tidy work.',
+                rating=float(5 - i % 3),
+                time_posted=f'{i + 1} weeks ago',
+                positive_points=['Punctuality'],
+                negative_points=['Price'] if i % 2 else None,
+                services_used=['Repair']
+            ) for i in range(count)]
+        )
+
+def benchmark_scraper(driver: webdriver.Chrome, max_results: int, review_tabs: int) -> dict:
+    """Run every scraping stage once against the fixture page."""
+    results = {}
+    profiler = Profiler()
+    profiler.wrap(driver)
+    scraper = GoogleMapsScraper(driver)
+
+    measure('search', results, profiler, lambda: scraper.search('Ansbach electrician'))
+    measure('scroll_results', results, profiler, lambda: scraper.scroll_results(max_results))
+    cards = driver.find_elements(By.CSS_SELECTOR, SELECTORS['business_cards'])[:max_results]
+
+    businesses = measure(
+        'extract_business_data', results, profiler,
+        lambda: [scraper.extract_business_data(card) for card in cards]
+    )
+    measure('extract_all_business_data', results, profiler, scraper.extract_all_business_data)
+
+    def get_all_reviews():
+        return [replace(business, reviews=scraper.get_reviews(card)) for business, card in zip(businesses, cards)]
+
+    businesses = measure('get_reviews', results, profiler, get_all_reviews)
+    results['get_reviews']['reviews_per_second'] = round(
+        sum(len(b.reviews) for b in businesses) / max(results['get_reviews']['seconds'], 1e-9), 1
+    )
+
+    def harvest_all_reviews():
+        harvester = ReviewHarvester(scraper, review_tabs)
+        links = driver.execute_script(CARD_LINKS, SELECTORS)[:max_results]
+        for index, link in enumerate(links):
+            harvester.submit(index, link)
+        while harvester.pending:
+            if not harvester.poll():
+                time.sleep(SCRAPER_CONFIG['async_poll_interval'])
+        return harvester
+
+    harvester = measure(f'harvest_reviews[{review_tabs} tabs]', results, profiler, harvest_all_reviews)
+    results[f'harvest_reviews[{review_tabs} tabs]']['reviews_per_second'] = round(harvester.reviews_per_second, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        measure('create_workbook', results, profiler,
+                lambda: create_workbook(businesses, os.path.join(tmp, 'businesses.xlsx')))
+
+    results['businesses'] = len(businesses)
+    results['reviews'] = sum(len(b.reviews) for b in businesses)
+    return results
+
+def benchmark_exports(sizes: List[int], formats: List[str]) -> dict:
+    """Time each output format on synthetic data of increasing review counts."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            businesses = synthetic_businesses(size)
+            for output_format in formats:
+                name = f'{output_format}[{size}]'
+                path = os.path.join(tmp, f'reviews_{size}.{EXPORTERS[output_format].extension}')
+
+                def export():
+                    with create_exporter(output_format, path) as exporter:
+                        for business in businesses:
+                            exporter.add_business(business)
+                        return exporter.paths
+
+                def export_store():
+                    # As --columnar does: collect into a store, then write it in one go
+                    with create_exporter(output_format, path) as exporter:
+                        store = ReviewStore()
+                        for business in businesses:
+                            store.add(business)
+                        exporter.add_store(store)
+                        return exporter.paths
+
+                for stage, func in ((name, export), (f'{name} columnar', export_store)):
+                    try:
+                        paths = measure(stage, results, None, func)
+                    except Exception as e:
+                        # e.g. parquet without pyarrow installed
+                        print_colored(f'{stage} skipped: {str(e)}', Colors.YELLOW)
+                        results.pop(stage, None)
+                        continue
+                    results[stage]['file_size_kb'] = round(sum(os.path.getsize(p) for p in paths) / 1024, 1)
+    return results
+
+def retained_memory(build: Callable):
+    """Build a value and return it with the Python memory it keeps alive in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_memory(sizes: List[int]) -> dict:
+    """Compare memory held by Review objects and by a ReviewStore."""
+    def build_store(size: int) -> ReviewStore:
+        store = ReviewStore()
+        for business in iter_synthetic_businesses(size):
+            store.add(business)
+        return store
+
+    results = {}
+    for size in sizes:
+        for name, build in (('objects', synthetic_businesses), ('store', build_store)):
+            value, retained = retained_memory(lambda: build(size))
+            del value
+            key = f'{name}[{size}]'
+            results[key] = {
+                'retained_kb': round(retained / 1024, 1),
+                'bytes_per_review': round(retained / size, 1)
+            }
+            print_colored(f'{key:<28} {retained / 1024:10.1f} KB {retained / size:8.1f} B/review', Colors.CYAN)
+    return results
+
+def normalize_per_value(businesses: List[Business], today: date) -> List[Business]:
+    """Baseline for the normalization benchmark: every value through its helper in turn."""
+    def points(values):
+        return format_review_points(values) if values is not None else None
+
+    normalized = []
+    for business in businesses:
+        reviews = []
+        for review in business.reviews:
+            date_posted = parse_time_posted(review.time_posted, today)
+            reviews.append(replace(
+                review,
+                text=truncate_text(review.text),
+                rating=validate_rating(review.rating),
+                positive_points=points(review.positive_points),
+                negative_points=points(review.negative_points),
+                date_posted=review.date_posted or (date_posted.isoformat() if date_posted else None)
+            ))
+        normalized.append(replace(
+            business,
+            phone=clean_phone_number(business.phone) if business.phone else None,
+            avg_rating=validate_rating(business.avg_rating),
+            reviews=reviews
+        ))
+    return normalized
+
+def benchmark_normalize(sizes: List[int]) -> dict:
+    """Compare batch normalization with per-value normalization on synthetic data."""
+    today = date.today()
+    results = {}
+    for size in sizes:
+        businesses = synthetic_businesses(size)
+        for name, normalize in (('per_value', normalize_per_value), ('batch', normalize_businesses)):
+            key = f'normalize_{name}[{size}]'
+            measure(key, results, None, lambda: normalize(businesses, today))
+            results[key]['reviews_per_second'] = round(size / max(results[key]['seconds'], 1e-9))
+    return results
+
+def parse_arguments():
+    """Parse command line arguments for the benchmark."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the scraper offline against local HTML fixtures'
+    )
+    parser.add_argument('--max-results', help='Cards to scrape (default: 50)', type=int, default=50)
+    parser.add_argument('--cards', help='Cards available in the fixture (default: 200)', type=int, default=200)
+    parser.add_argument('--reviews', help='Reviews per fixture business (default: 10)', type=int, default=10)
+    parser.add_argument('--delay', help='Fixture lazy-load delay in ms (default: 150)', type=int, default=150)
+    parser.add_argument('--review-tabs', help='Background tabs for the harvested reviews stage (default: 4)',
+                        type=int, default=4)
+    parser.add_argument(
+        '--export-sizes',
+        help='Synthetic review counts for the export benchmark (default: 1000 10000 100000)',
+        type=int,
+        nargs='*',
+        default=[1000, 10000, 100000]
+    )
+    parser.add_argument(
+        '--formats',
+        help='Output formats for the export benchmark (default: all)',
+        choices=list(EXPORTERS),
+        nargs='*',
+        default=list(EXPORTERS)
+    )
+    parser.add_argument(
+        '--memory-sizes',
+        help='Synthetic review counts for the memory benchmark (default: 10000 100000)',
+        type=int,
+        nargs='*',
+        default=[10000, 100000]
+    )
+    parser.add_argument(
+        '--normalize-sizes',
+        help='Synthetic review counts for the normalization benchmark (default: 10000 100000)',
+        type=int,
+        nargs='*',
+        default=[10000, 100000]
+    )
+    parser.add_argument('--skip-browser', help='Only run the benchmarks that need no browser', action='store_true')
+    parser.add_argument(
+        '--trace-memory',
+        help='Record peak Python memory per stage (slows the timed stages down)',
+        action='store_true'
+    )
+    parser.add_argument('--headless', help='Run Chrome in headless mode', action='store_true')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/TIMESTAMP.json)', type=str)
+    return parser.parse_args()
+
+def main():
+    """Run the offline benchmarks and store the results as JSON."""
+    global TRACE_MEMORY
+
+    args = parse_arguments()
+    TRACE_MEMORY = args.trace_memory
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': vars(args)
+    }
+
+    if not args.skip_browser:
+        server, maps_url = serve_fixtures({'cards': args.cards, 'reviews': args.reviews, 'delay': args.delay})
+        SCRAPER_CONFIG['maps_url'] = maps_url
+        # The fixture server is local, so pacing would only skew the timings
+        SCRAPER_CONFIG['rate_initial'] = SCRAPER_CONFIG['rate_max'] = 1000.0
+        driver = setup_driver(args.headless)
+        try:
+            print_colored(f'Scraper stages against {maps_url}', Colors.BLUE)
+            report['scraper'] = benchmark_scraper(driver, args.max_results, args.review_tabs)
+        finally:
+            driver.quit()
+            server.shutdown()
+
+    if args.export_sizes and args.formats:
+        print_colored('Export on synthetic data', Colors.BLUE)
+        report['export'] = benchmark_exports(args.export_sizes, args.formats)
+
+    if args.normalize_sizes:
+        print_colored('Normalization on synthetic data', Colors.BLUE)
+        report['normalize'] = benchmark_normalize(args.normalize_sizes)
+
+    if args.memory_sizes:
+        print_colored('Memory of review objects vs columnar store', Colors.BLUE)
+        report['memory'] = benchmark_memory(args.memory_sizes)
+
+    output_file = args.output or os.path.join(RESULTS_DIR, f'{time.strftime("%Y%m%d_%H%M%S")}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print_colored(f'Results written to {output_file}', Colors.GREEN)
+
+if __name__ == '__main__':
+    main()
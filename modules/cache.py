@@ -0,0 +1,97 @@
+from dataclasses import asdict
+from typing import Optional
+import json
+import sqlite3
+import threading
+import time
+
+from .const.settings import Business, Review
+
+def business_key(business: Business) -> str:
+    """Stable identity for a business based on its name and address."""
+    parts = [business.name, business.street_address, business.postal_code, business.city]
+    return '|'.join(' '.join((part or '').lower().split()) for part in parts)
+
+def review_key(review: Review) -> str:
+    """Rating and text of a review; time_posted is relative and drifts, so it is left out.
+
+    Different reviews can share the key, such as ratings without text, so it
+    only identifies a review together with its position or count.
+    """
+    return f'{review.rating}|{" ".join(review.text.split())}'
+
+def business_to_dict(business: Business) -> dict:
+    """Convert a Business and its reviews to plain JSON-compatible data."""
+    return asdict(business)
+
+def business_from_dict(data: dict) -> Business:
+    """Rebuild a Business and its reviews from plain data."""
+    data = dict(data)
+    data['reviews'] = [Review(**review) for review in data.get('reviews', [])]
+    return Business(**data)
+
+class BusinessCache:
+    """SQLite cache of scraped businesses with TTL and size-based eviction.
+
+    Entries older than ttl are no longer served as fresh but are kept until
+    retention so incremental refreshes can still see the stored reviews.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int, retention: float):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.retention = max(retention, ttl)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS businesses ('
+            'key TEXT PRIMARY KEY, data TEXT NOT NULL, scraped_at REAL NOT NULL)'
+        )
+        self.evict()
+
+    def get(self, key: str) -> Optional[Business]:
+        """Return the cached business if present and still fresh."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT data FROM businesses WHERE key = ? AND scraped_at >= ?',
+                (key, time.time() - self.ttl)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return business_from_dict(json.loads(row[0]))
+
+    def get_latest(self, key: str) -> Optional[Business]:
+        """Return the stored business regardless of age, without counting a hit or miss."""
+        with self.lock:
+            row = self.conn.execute('SELECT data FROM businesses WHERE key = ?', (key,)).fetchone()
+            return business_from_dict(json.loads(row[0])) if row else None
+
+    def put(self, business: Business) -> None:
+        """Store or refresh a business and its reviews."""
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO businesses (key, data, scraped_at) VALUES (?, ?, ?)',
+                (business_key(business), json.dumps(business_to_dict(business)), time.time())
+            )
+            self.conn.commit()
+
+    def evict(self) -> None:
+        """Drop entries past retention, then the oldest ones beyond max_entries."""
+        with self.lock:
+            self.conn.execute('DELETE FROM businesses WHERE scraped_at < ?', (time.time() - self.retention,))
+            self.conn.execute(
+                'DELETE FROM businesses WHERE key NOT IN '
+                '(SELECT key FROM businesses ORDER BY scraped_at DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.evict()
+        self.conn.close()
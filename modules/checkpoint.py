@@ -0,0 +1,66 @@
+from typing import Dict
+import json
+import os
+import threading
+
+from .cache import business_key, business_to_dict, business_from_dict
+from .const.settings import Business
+
+class Checkpoint:
+    """Append-only JSONL log of finished businesses and queries for resuming runs."""
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.completed_queries = set()
+        self.businesses: Dict[str, Dict[str, Business]] = {}
+
+        if resume and os.path.exists(path):
+            self._load()
+            mode = 'a'
+        else:
+            mode = 'w'
+        self.file = open(path, mode, encoding='utf-8')
+
+    def _load(self) -> None:
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash mid-write can leave a truncated last line
+                    continue
+
+                if record['type'] == 'business':
+                    business = business_from_dict(record['business'])
+                    self.businesses.setdefault(record['query'], {})[business_key(business)] = business
+                elif record['type'] == 'query_done':
+                    self.completed_queries.add(record['query'])
+
+    def _write(self, record: dict) -> None:
+        with self.lock:
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+
+    def add_business(self, query: str, business: Business) -> None:
+        """Record a fully scraped business for a query."""
+        with self.lock:
+            self.businesses.setdefault(query, {})[business_key(business)] = business
+        self._write({'type': 'business', 'query': query, 'business': business_to_dict(business)})
+
+    def complete_query(self, query: str) -> None:
+        """Mark a query as finished so resumed runs skip it entirely."""
+        with self.lock:
+            self.completed_queries.add(query)
+        self._write({'type': 'query_done', 'query': query})
+
+    def is_query_done(self, query: str) -> bool:
+        return query in self.completed_queries
+
+    def businesses_for(self, query: str) -> Dict[str, Business]:
+        """Businesses already scraped for a query, keyed by business_key."""
+        with self.lock:
+            return dict(self.businesses.get(query, {}))
+
+    def close(self) -> None:
+        self.file.close()
@@ -1,5 +1,7 @@
 import argparse
 
+from .const.settings import SCRAPER_CONFIG
+
 def parse_arguments():
     """Parse command line arguments for the scraper."""
     parser = argparse.ArgumentParser(
@@ -9,13 +11,15 @@ def parse_arguments():
     parser.add_argument(
         'location',
         help='Location to search in (e.g., "Ansbach")',
-        type=str
+        type=str,
+        nargs='?'
     )
     
     parser.add_argument(
         'business_type',
         help='Type of business to search for (e.g., "electrician")',
-        type=str
+        type=str,
+        nargs='?'
     )
     
     parser.add_argument(
@@ -27,10 +31,17 @@ def parse_arguments():
     
     parser.add_argument(
         '--output',
-        help='Output Excel file path (default: businesses_TIMESTAMP.xlsx)',
+        help='Output file path (default: businesses_TIMESTAMP with the extension of --format)',
         type=str
     )
     
+    parser.add_argument(
+        '--format',
+        help='Output format (default: xlsx)',
+        choices=['xlsx', 'csv', 'jsonl', 'parquet', 'sqlite'],
+        default='xlsx'
+    )
+    
     parser.add_argument(
         '--headless',
         help='Run Chrome in headless mode',
@@ -43,4 +54,244 @@ def parse_arguments():
         action='store_true'
     )
     
-    return parser.parse_args()
\ No newline at end of file
+    parser.add_argument(
+        '--queries-file',
+        help='File with one search query per line (batch mode)',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--locations',
+        help='Locations to combine with --business-types (batch mode)',
+        type=str,
+        nargs='+'
+    )
+    
+    parser.add_argument(
+        '--business-types',
+        help='Business types to combine with --locations (batch mode)',
+        type=str,
+        nargs='+'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        help='Number of parallel Chrome workers in batch, worker and --serve mode (default: 1)',
+        type=int,
+        default=1
+    )
+    
+    parser.add_argument(
+        '--cache',
+        help='SQLite file to cache scraped businesses in between runs',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        help='Seconds a cached business stays fresh (default: 86400)',
+        type=int,
+        default=SCRAPER_CONFIG['cache_ttl']
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        help='Only fetch reviews newer than those stored in the cache (requires --cache)',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--checkpoint',
+        help='JSONL file that finished businesses and queries are appended to',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--resume',
+        help='Resume from --checkpoint, skipping queries and businesses already done',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        help='Scraping engine: one tab at a time (sync) or several tabs in one browser (async)',
+        choices=['sync', 'async'],
+        default='sync'
+    )
+    
+    parser.add_argument(
+        '--tabs',
+        help='Number of concurrent tabs for the async engine (default: 4)',
+        type=int,
+        default=4
+    )
+    
+    parser.add_argument(
+        '--lean',
+        help='Block images, fonts, media, map tiles and analytics and disable GPU and extensions',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--profile-dir',
+        help='Directory of Chrome profiles reused between runs (one per worker)',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--profile',
+        help='Count and time WebDriver commands per stage and print a summary',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--metrics-json',
+        help='Write profiling metrics to this JSON file (requires --profile)',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--metrics-prom',
+        help='Write profiling metrics to this Prometheus textfile (requires --profile)',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--network',
+        help='Parse business and review data from captured XHR responses, falling back to the page',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--bbox',
+        help='Tile this bounding box instead of searching by location name; '
+             '--max-results then applies per tile, and full tiles are subdivided',
+        type=float,
+        nargs=4,
+        metavar=('SOUTH', 'WEST', 'NORTH', 'EAST')
+    )
+    
+    parser.add_argument(
+        '--tile-grid',
+        help='Split --bbox into an N x N grid of tiles (default: 2)',
+        type=int,
+        default=2
+    )
+    
+    parser.add_argument(
+        '--dedup',
+        help='Skip places already scraped by another query or tile before fetching their reviews',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--dedup-db',
+        help='SQLite file that keeps the dedup index across runs (implies --dedup)',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--review-tabs',
+        help='Load reviews in this many background tabs per browser while the results scroll (default: 0, inline)',
+        type=int,
+        default=0
+    )
+    
+    parser.add_argument(
+        '--normalize',
+        help='Clean phones, validate ratings, strip review point icons and date undated cached reviews before export',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--columnar',
+        help='Hold reviews in a compact columnar store and write them in large blocks',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        help='Page operations per second to start at across all workers (default: 1.0); '
+             'the rate then adapts to latency and failures',
+        type=float
+    )
+    
+    parser.add_argument(
+        '--max-rate',
+        help='Highest page operations per second the rate may ramp up to (default: 10.0)',
+        type=float
+    )
+    
+    parser.add_argument(
+        '--queue',
+        help='Shared job queue: a SQLite file or a redis:// URL (requires redis); with jobs given, '
+             'queue them and collect the results into the output',
+        type=str
+    )
+    
+    parser.add_argument(
+        '--worker',
+        help='Scrape jobs from --queue on --workers browsers and push the results back to it',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--serve',
+        help='Run as a daemon that keeps --workers browsers warm and takes scrape jobs over a local HTTP/JSON API',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--host',
+        help=f'Interface for --serve to listen on (default: {SCRAPER_CONFIG["service_host"]})',
+        type=str,
+        default=SCRAPER_CONFIG['service_host']
+    )
+    
+    parser.add_argument(
+        '--port',
+        help=f'Port for --serve to listen on (default: {SCRAPER_CONFIG["service_port"]})',
+        type=int,
+        default=SCRAPER_CONFIG['service_port']
+    )
+    
+    args = parser.parse_args()
+    
+    if bool(args.locations) != bool(args.business_types):
+        parser.error('--locations and --business-types must be used together')
+    if not (args.queries_file or args.locations or args.worker or args.serve) and not (args.location and args.business_type):
+        parser.error('location and business_type are required unless a batch mode option, --worker or --serve is given')
+    if args.incremental and not args.cache:
+        parser.error('--incremental requires --cache')
+    if args.resume and not args.checkpoint:
+        parser.error('--resume requires --checkpoint')
+    if args.engine == 'async' and (args.cache or args.checkpoint or args.dedup or args.dedup_db or args.profile):
+        parser.error('--engine async does not support --cache, --checkpoint, --dedup, --dedup-db or --profile')
+    if args.tabs < 1:
+        parser.error('--tabs must be at least 1')
+    if (args.metrics_json or args.metrics_prom) and not args.profile:
+        parser.error('--metrics-json and --metrics-prom require --profile')
+    if args.bbox and (args.queries_file or args.locations or args.engine == 'async'):
+        parser.error('--bbox cannot be combined with batch options or --engine async')
+    if args.bbox and (args.bbox[0] >= args.bbox[2] or args.bbox[1] >= args.bbox[3]):
+        parser.error('--bbox must be given as SOUTH WEST NORTH EAST')
+    if args.tile_grid < 1:
+        parser.error('--tile-grid must be at least 1')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.review_tabs < 0:
+        parser.error('--review-tabs cannot be negative')
+    if args.review_tabs and args.engine == 'async':
+        parser.error('--review-tabs cannot be combined with --engine async')
+    if args.worker and not args.queue:
+        parser.error('--worker requires --queue')
+    if args.queue and (args.bbox or args.checkpoint or args.engine == 'async'):
+        parser.error('--queue cannot be combined with --bbox, --checkpoint or --engine async')
+    if args.serve and (args.queries_file or args.locations or args.location or args.queue or args.bbox
+                       or args.checkpoint or args.dedup or args.dedup_db or args.engine == 'async'):
+        parser.error('--serve takes its jobs over HTTP and cannot be combined with jobs, --queue, --bbox, '
+                     '--checkpoint, --dedup, --dedup-db or --engine async')
+    if (args.rate is not None and args.rate <= 0) or (args.max_rate is not None and args.max_rate <= 0):
+        parser.error('--rate and --max-rate must be positive')
+    
+    return args
\ No newline at end of file
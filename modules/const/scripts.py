@@ -0,0 +1,153 @@
+# JavaScript snippets injected into the page via execute_script
+
+# Extract every loaded business card in a single round-trip.
+# arguments[0]: SELECTORS map
+EXTRACT_BUSINESS_CARDS = '''
+const selectors = arguments[0];
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText : null;
+};
+const attr = (root, selector, name) => {
+    const el = root.querySelector(selector);
+    return el ? el.getAttribute(name) : null;
+};
+return Array.from(document.querySelectorAll(selectors.business_cards)).map(card => ({
+    name: text(card, selectors.name),
+    address: text(card, selectors.address),
+    phone: text(card, selectors.phone),
+    website: attr(card, selectors.website, 'href'),
+    rating: text(card, selectors.rating),
+    review_count: text(card, selectors.review_count)
+}));
+'''
+
+# Scroll the results feed and resolve as soon as new cards arrive, the end of
+# the list shows up, or the timeout expires.
+# arguments[0]: SELECTORS map, arguments[1]: timeout in ms
+SCROLL_AND_WAIT = '''
+const selectors = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const feed = document.querySelector(selectors.business_list);
+if (!feed) {
+    done({count: 0, ended: true, waited: 0});
+    return;
+}
+const countCards = () => feed.querySelectorAll(selectors.business_cards).length;
+const isEnd = () => document.querySelector(selectors.end_of_list) !== null;
+const before = countCards();
+const start = performance.now();
+let finished = false;
+let timer = null;
+const observer = new MutationObserver(() => {
+    if (countCards() > before || isEnd()) finish();
+});
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done({count: countCards(), ended: isEnd(), waited: (performance.now() - start) / 1000});
+};
+observer.observe(feed, {childList: true, subtree: true});
+timer = setTimeout(finish, timeoutMs);
+feed.scrollTop = feed.scrollHeight;
+'''
+
+# Scroll the results feed once without waiting and report its current state.
+# arguments[0]: SELECTORS map
+SCROLL_FEED = '''
+const selectors = arguments[0];
+const feed = document.querySelector(selectors.business_list);
+if (!feed) return null;
+feed.scrollTop = feed.scrollHeight;
+return {
+    count: feed.querySelectorAll(selectors.business_cards).length,
+    ended: document.querySelector(selectors.end_of_list) !== null
+};
+'''
+
+# Page load time and bytes transferred since the last navigation.
+# transferSize is 0 for cross-origin resources without Timing-Allow-Origin,
+# so the byte count is a lower bound.
+PAGE_TRAFFIC = '''
+const navigation = performance.getEntriesByType('navigation')[0];
+const entries = performance.getEntriesByType('resource');
+let bytes = navigation ? navigation.transferSize : 0;
+for (const entry of entries) bytes += entry.transferSize || 0;
+return {
+    load_time: navigation ? navigation.loadEventEnd / 1000 : null,
+    bytes: bytes,
+    requests: entries.length
+};
+'''
+
+# Detail page URL of every loaded business card, null where a card has none.
+# arguments[0]: SELECTORS map
+CARD_LINKS = '''
+const selectors = arguments[0];
+return Array.from(document.querySelectorAll(selectors.business_cards)).map(card => {
+    const link = card.querySelector(selectors.detail_link);
+    return link ? link.href : null;
+});
+'''
+
+# Switch the open reviews pane to newest first and resolve true once the
+# list has reloaded, or false when there is no sort menu or it timed out.
+# arguments[0]: SELECTORS map, arguments[1]: timeout in ms,
+# arguments[2]: element holding the reviews, or null for the whole page
+SORT_REVIEWS_NEWEST = '''
+const selectors = arguments[0];
+const timeoutMs = arguments[1];
+const scope = arguments[2] || document;
+const done = arguments[arguments.length - 1];
+const button = scope.querySelector(selectors.reviews_sort) || document.querySelector(selectors.reviews_sort);
+if (!button) {
+    done(false);
+    return;
+}
+const first = scope.querySelector(selectors.review_items);
+const start = performance.now();
+let chosen = false;
+const poll = () => {
+    if (!chosen) {
+        const newest = document.querySelector(selectors.reviews_sort_newest);
+        if (newest) {
+            newest.click();
+            chosen = true;
+        }
+    } else if ((!first || !first.isConnected) && scope.querySelector(selectors.review_items)) {
+        done(true);
+        return;
+    }
+    if (performance.now() - start > timeoutMs) {
+        done(false);
+        return;
+    }
+    setTimeout(poll, 50);
+};
+button.click();
+poll();
+'''
+
+# Extract every loaded review of the page in a single round-trip.
+# arguments[0]: SELECTORS map
+EXTRACT_REVIEWS = '''
+const selectors = arguments[0];
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText : null;
+};
+return Array.from(document.querySelectorAll(selectors.review_items)).map(item => {
+    const rating = item.querySelector(selectors.review_rating);
+    return {
+        text: text(item, selectors.review_text),
+        rating: rating ? rating.getAttribute('aria-label') : null,
+        time_posted: text(item, selectors.review_time),
+        points: text(item, selectors.review_points),
+        services: Array.from(item.querySelectorAll(selectors.review_services)).map(el => el.innerText),
+        review_id: item.getAttribute('data-review-id')
+    };
+});
+'''
@@ -1,16 +1,35 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+import sys
 
-@dataclass
+# One shared tuple per distinct list of point or service labels
+_shared_values: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def _shared(values: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    if values is None:
+        return None
+    key = tuple(sys.intern(value) for value in values)
+    return _shared_values.setdefault(key, key)
+
+@dataclass(frozen=True, slots=True)
 class Review:
     text: str
     rating: float
     time_posted: str
-    positive_points: Optional[List[str]] = None
-    negative_points: Optional[List[str]] = None
-    services_used: Optional[List[str]] = None
+    positive_points: Optional[Tuple[str, ...]] = None
+    negative_points: Optional[Tuple[str, ...]] = None
+    services_used: Optional[Tuple[str, ...]] = None
+    date_posted: Optional[str] = None  # ISO date derived from time_posted by normalization
+    review_id: Optional[str] = None  # Maps' id of the review, when the page or response carries it
+
+    def __post_init__(self):
+        # Time phrases and labels repeat across reviews, so keep one copy of each
+        object.__setattr__(self, 'time_posted', sys.intern(self.time_posted))
+        object.__setattr__(self, 'positive_points', _shared(self.positive_points))
+        object.__setattr__(self, 'negative_points', _shared(self.negative_points))
+        object.__setattr__(self, 'services_used', _shared(self.services_used))
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Business:
     name: str
     street_address: str
@@ -34,15 +53,18 @@ SELECTORS = {
     'end_of_list': '.section-loading-spinner',
     
     # Business details
-    'name': '[jstcache*=""] .fontHeadlineSmall',
+    'name': '[jstcache] .fontHeadlineSmall',
     'address': '[data-item-id*="address"]',
     'phone': '[data-item-id*="phone"]',
     'website': '[data-item-id*="authority"]',
-    'rating': '[jstcache*=""] .fontDisplayLarge',
-    'review_count': '[jstcache*=""] .fontBodyMedium span',
+    'rating': '[jstcache] .fontDisplayLarge',
+    'review_count': '[jstcache] .fontBodyMedium span',
     
     # Review elements
     'reviews_tab': '[data-tab-index="1"]',
+    'reviews_sort': 'button[aria-label*="Sort"]',
+    'reviews_sort_newest': '[role="menuitemradio"][data-index="1"]',
+    'detail_link': 'a[href*="/maps/place/"]',
     'review_items': '.jftiEf',
     'review_text': '.wiI7pd',
     'review_rating': '.kvMYJc',
@@ -51,9 +73,78 @@ SELECTORS = {
     'review_services': '.k8MTF span:first-child'
 }
 
+# URL fragments of the XHR responses that carry search results and reviews
+RESPONSE_URLS = {
+    'search': '/search?tbm=map',
+    'reviews': '/maps/rpc/listugcposts'
+}
+
+# Index paths into the decoded JSON of those responses. Like SELECTORS these
+# follow the current Maps frontend and need updating when it changes.
+RESPONSE_PATHS = {
+    # Search response
+    'results': [0, 1],
+    'place': [14],
+    'name': [11],
+    'address': [39],
+    'phone': [178, 0, 0],
+    'website': [7, 0],
+    'rating': [4, 7],
+    'review_count': [4, 8],
+    
+    # Reviews response
+    'reviews': [2],
+    'review_text': [0, 2, -1, 0, 0],
+    'review_rating': [0, 2, 0, 0],
+    'review_time': [0, 1, 6],
+    'review_id': [0, 0]
+}
+
+# URL patterns blocked in lean mode; only text is read, so tiles, images,
+# fonts, media and analytics are never needed
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+    '*/maps/vt*', '*/kh/v*', '*/maps/preview/tile*', '*streetviewpixels*',
+    '*googletagmanager.com*', '*google-analytics.com*', '*/gen_204*', '*/log?*'
+]
+
 # Basic scraper configuration
 SCRAPER_CONFIG = {
-    'scroll_delay': 1.5,  # Delay between scrolls in seconds
+    'maps_url': 'https://www.google.com/maps',  # Base URL, pointed at a local server for offline runs
+    'scroll_timeout': 3.0,  # Maximum time to wait for new results after a scroll in seconds
     'page_load_timeout': 30,  # Maximum time to wait for page load in seconds
-    'max_retries': 3  # Maximum number of retry attempts for failed operations
+    'max_retries': 3,  # Maximum number of retry attempts for failed operations
+    'bulk_extraction': True,  # Extract all cards with one execute_script call
+    'cache_ttl': 86400,  # Seconds a cached business stays fresh
+    'cache_max_entries': 100000,  # Oldest cached businesses beyond this are evicted
+    'cache_retention': 2592000,  # Seconds a stale business is kept for incremental refreshes
+    'review_scroll_timeout': 2.0,  # Maximum time to wait for more reviews after a scroll in seconds
+    'review_anchor_run': 3,  # Newest stored reviews that must reappear in order to stop an incremental fetch without review ids
+    'async_poll_interval': 0.2,  # Seconds between page state polls in the async engine and review tabs
+    'network_extraction': False,  # Parse captured XHR responses before falling back to the DOM
+    'lean': False,  # Block LEAN_BLOCKED_URLS in every tab, set by --lean
+    'tile_max_depth': 3,  # How often a tile that hits the result cap may be split into quadrants
+    'export_queue_size': 100,  # Businesses waiting for the writer thread before scrapers block
+    'rate_initial': 1.0,  # Page operations per second across all workers at start
+    'rate_min': 0.1,  # Lowest rate the controller backs off to
+    'rate_max': 10.0,  # Highest rate the controller ramps up to
+    'rate_increase': 0.1,  # Operations per second added after each fast success
+    'rate_decrease': 0.5,  # Factor applied to rate and concurrency on failure or throttling
+    'concurrency_max': 16,  # Most page operations in flight at once across all workers
+    'latency_target': 10.0,  # Operations slower than this in seconds count as congestion
+    'backoff_base': 1.0,  # Retry delay ceiling for the first retry in seconds, doubled per retry
+    'backoff_cap': 60.0,  # Largest retry delay ceiling in seconds
+    'driver_max_queries': 50,  # Queries a pooled driver runs before it is replaced by a fresh one
+    'driver_max_memory_mb': 1024,  # JS heap size in MB after which a pooled driver is replaced
+    'normalize_batch_size': 500,  # Most queued businesses the writer normalizes and exports as one batch
+    'columnar_flush_reviews': 100000,  # Reviews held in the columnar store before --columnar writes them out
+    'review_tabs': 0,  # Background tabs per driver that load reviews while results scroll; 0 loads them inline
+    'job_lease': 300,  # Seconds a worker holds a queued job before it is handed to another worker
+    'job_heartbeat': 60,  # Seconds between lease renewals while a worker scrapes a job
+    'job_max_attempts': 3,  # Times a queued job is leased before it is marked failed
+    'job_poll_interval': 2.0,  # Seconds idle workers and the collector wait between queue polls
+    'service_host': '127.0.0.1',  # Interface the --serve API listens on; local only by default
+    'service_port': 8765  # Port of the --serve API
 }
\ No newline at end of file
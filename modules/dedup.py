@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, Optional
+import sqlite3
+import threading
+
+from .cache import business_key
+from .helpers import clean_phone_number
+from .const.settings import Business
+
+def business_identity(business: Business) -> str:
+    """Normalized identity of a place: its business key plus the cleaned phone."""
+    phone = clean_phone_number(business.phone) if business.phone else ''
+    return f'{business_key(business)}|{phone}'
+
+class DedupIndex:
+    """Index of places already claimed by any query, tile or worker in a run.
+
+    Kept in memory; with a path the identities are also stored in SQLite so
+    duplicates are recognised across runs as well. Each claim records its
+    owner (the query or tile that took the place), so a job that runs again,
+    such as a requeued queue job, can take back its own places.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.lock = threading.Lock()
+        self.seen: Dict[str, Optional[str]] = {}  # Identity -> owner
+        self.skipped = 0
+        self.conn = None
+
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute('CREATE TABLE IF NOT EXISTS seen (identity TEXT PRIMARY KEY, owner TEXT)')
+            columns = [row[1] for row in self.conn.execute('PRAGMA table_info(seen)')]
+            if 'owner' not in columns:
+                # Indexes written before claims had owners
+                self.conn.execute('ALTER TABLE seen ADD COLUMN owner TEXT')
+            self.seen.update(self.conn.execute('SELECT identity, owner FROM seen'))
+
+    def claim(self, identity: str, owner: Optional[str] = None) -> bool:
+        """Record an identity; returns False if another owner already claimed it."""
+        with self.lock:
+            if identity in self.seen:
+                if owner is not None and self.seen[identity] == owner:
+                    return True
+                self.skipped += 1
+                return False
+
+            self.seen[identity] = owner
+            if self.conn:
+                self.conn.execute('INSERT OR IGNORE INTO seen (identity, owner) VALUES (?, ?)', (identity, owner))
+                self.conn.commit()
+            return True
+
+    def release(self, identities: Iterable[str]) -> None:
+        """Forget claims whose places were never finished, so another query can take them."""
+        identities = list(identities)
+        with self.lock:
+            for identity in identities:
+                self.seen.pop(identity, None)
+            if self.conn and identities:
+                self.conn.executemany('DELETE FROM seen WHERE identity = ?', [(i,) for i in identities])
+                self.conn.commit()
+
+    def close(self) -> None:
+        if self.conn:
+            self.conn.close()
@@ -0,0 +1,333 @@
+from array import array
+from dataclasses import asdict
+from typing import List
+import csv
+import json
+import os
+import sqlite3
+
+from .workbook import StreamingWorkbook
+from .reviewstore import ReviewStore
+from .const.settings import Business
+
+# Business table columns; business_id links reviews to their business
+BUSINESS_COLUMNS = [
+    'business_id',
+    'name',
+    'street_address',
+    'postal_code',
+    'city',
+    'phone',
+    'website',
+    'avg_rating',
+    'num_ratings'
+]
+
+# Review table columns
+REVIEW_COLUMNS = [
+    'business_id',
+    'text',
+    'rating',
+    'time_posted',
+    'positive_points',
+    'negative_points',
+    'services_used',
+    'date_posted'
+]
+
+class Exporter:
+    """Base class for output backends that receive businesses one at a time.
+
+    Table-shaped backends write a businesses table and a reviews table
+    linked by business_id instead of repeating the business per review.
+    """
+
+    extension = ''
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self.base = os.path.splitext(output_file)[0]
+        self.next_id = 1
+        self.paths = [output_file]
+
+    def add_business(self, business: Business) -> None:
+        business_id = self.next_id
+        self.next_id += 1
+
+        self.write_business(self._business_row(business_id, business))
+        for review in business.reviews:
+            self.write_review([
+                business_id,
+                review.text,
+                review.rating,
+                review.time_posted,
+                self._join(review.positive_points),
+                self._join(review.negative_points),
+                self._join(review.services_used),
+                review.date_posted
+            ])
+
+    def add_store(self, store: ReviewStore) -> None:
+        """Write every business and review of a store without building Review objects."""
+        first_id = self.next_id
+        for business in store.shells:
+            self.write_business(self._business_row(self.next_id, business))
+            self.next_id += 1
+
+        for index, text, rating, time_posted, positive, negative, services, date_posted in store.review_rows():
+            self.write_review([
+                first_id + index,
+                text,
+                rating,
+                time_posted,
+                self._join(positive),
+                self._join(negative),
+                self._join(services),
+                date_posted
+            ])
+
+    def _business_row(self, business_id: int, business: Business) -> list:
+        return [
+            business_id,
+            business.name,
+            business.street_address,
+            business.postal_code,
+            business.city,
+            business.phone,
+            business.website,
+            business.avg_rating,
+            business.num_ratings
+        ]
+
+    def _join(self, values):
+        """How list fields are stored; text backends join them into one cell."""
+        return '\n'.join(values) if values else ''
+
+    def write_business(self, row: list) -> None:
+        raise NotImplementedError
+
+    def write_review(self, row: list) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'Exporter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+class CsvExporter(Exporter):
+    """Write <name>_businesses.csv and <name>_reviews.csv."""
+
+    extension = 'csv'
+
+    def __init__(self, output_file: str):
+        super().__init__(output_file)
+        self.paths = [f'{self.base}_businesses.csv', f'{self.base}_reviews.csv']
+        self.files = [open(path, 'w', newline='', encoding='utf-8') for path in self.paths]
+        self.businesses = csv.writer(self.files[0])
+        self.reviews = csv.writer(self.files[1])
+        self.businesses.writerow(BUSINESS_COLUMNS)
+        self.reviews.writerow(REVIEW_COLUMNS)
+
+    def write_business(self, row: list) -> None:
+        self.businesses.writerow(row)
+
+    def write_review(self, row: list) -> None:
+        self.reviews.writerow(row)
+
+    def close(self) -> None:
+        for f in self.files:
+            f.close()
+
+class JsonlExporter(Exporter):
+    """Write one JSON object per business with its reviews nested inside."""
+
+    extension = 'jsonl'
+
+    def __init__(self, output_file: str):
+        super().__init__(output_file)
+        self.file = open(output_file, 'w', encoding='utf-8')
+
+    def add_business(self, business: Business) -> None:
+        record = {'business_id': self.next_id, **asdict(business)}
+        self.next_id += 1
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def add_store(self, store: ReviewStore) -> None:
+        # Reviews are nested, so each business is rebuilt in turn
+        for business in store.businesses():
+            self.add_business(business)
+
+    def close(self) -> None:
+        self.file.close()
+
+class SqliteExporter(Exporter):
+    """Write businesses and reviews tables into one SQLite database."""
+
+    extension = 'db'
+
+    # Rows written between commits
+    COMMIT_EVERY = 5000
+
+    def __init__(self, output_file: str):
+        super().__init__(output_file)
+        # Created here but written from the export pipeline's writer thread
+        self.conn = sqlite3.connect(output_file, check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS businesses ('
+            'business_id INTEGER PRIMARY KEY, name TEXT, street_address TEXT, postal_code TEXT, '
+            'city TEXT, phone TEXT, website TEXT, avg_rating REAL, num_ratings INTEGER)'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS reviews ('
+            'review_id INTEGER PRIMARY KEY, '
+            'business_id INTEGER NOT NULL REFERENCES businesses(business_id), '
+            'text TEXT, rating REAL, time_posted TEXT, '
+            'positive_points TEXT, negative_points TEXT, services_used TEXT, date_posted TEXT)'
+        )
+        self.next_id = (self.conn.execute('SELECT MAX(business_id) FROM businesses').fetchone()[0] or 0) + 1
+        self.uncommitted = 0
+
+    def write_business(self, row: list) -> None:
+        self.conn.execute(f'INSERT INTO businesses ({", ".join(BUSINESS_COLUMNS)}) VALUES ({", ".join("?" * len(row))})', row)
+        self._maybe_commit()
+
+    def write_review(self, row: list) -> None:
+        self.conn.execute(f'INSERT INTO reviews ({", ".join(REVIEW_COLUMNS)}) VALUES ({", ".join("?" * len(row))})', row)
+        self._maybe_commit()
+
+    def _maybe_commit(self) -> None:
+        self.uncommitted += 1
+        if self.uncommitted >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self.uncommitted = 0
+
+    def close(self) -> None:
+        self.conn.execute('CREATE INDEX IF NOT EXISTS reviews_business_id ON reviews (business_id)')
+        self.conn.commit()
+        self.conn.close()
+
+class ParquetExporter(Exporter):
+    """Write compressed columnar <name>_businesses.parquet and <name>_reviews.parquet.
+
+    Requires pyarrow. Rows are buffered and flushed as row groups.
+    """
+
+    extension = 'parquet'
+
+    # Rows per row group
+    BATCH_SIZE = 10000
+
+    def __init__(self, output_file: str):
+        super().__init__(output_file)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise Exception('Parquet output requires pyarrow (pip install pyarrow)')
+
+        self.pa = pa
+        self.paths = [f'{self.base}_businesses.parquet', f'{self.base}_reviews.parquet']
+        strings = pa.list_(pa.string())
+        self.schemas = [
+            pa.schema([
+                ('business_id', pa.int64()), ('name', pa.string()), ('street_address', pa.string()),
+                ('postal_code', pa.string()), ('city', pa.string()), ('phone', pa.string()),
+                ('website', pa.string()), ('avg_rating', pa.float64()), ('num_ratings', pa.int64())
+            ]),
+            pa.schema([
+                ('business_id', pa.int64()), ('text', pa.string()), ('rating', pa.float64()),
+                ('time_posted', pa.string()), ('positive_points', strings),
+                ('negative_points', strings), ('services_used', strings), ('date_posted', pa.string())
+            ])
+        ]
+        self.writers = [
+            pq.ParquetWriter(path, schema, compression='zstd')
+            for path, schema in zip(self.paths, self.schemas)
+        ]
+        self.buffers: List[list] = [[], []]
+
+    def _join(self, values):
+        return values
+
+    def add_store(self, store: ReviewStore) -> None:
+        """Write the review columns as Arrow arrays straight from the store's buffers."""
+        pa = self.pa
+        first_id = self.next_id
+        for business in store.shells:
+            self.write_business(self._business_row(self.next_id, business))
+            self.next_id += 1
+        self._flush(1)
+
+        count = len(store)
+        if not count:
+            return
+
+        business_ids = array('q')
+        for index in range(len(store.shells)):
+            business_ids.extend([first_id + index] * (store.starts[index + 1] - store.starts[index]))
+
+        values = store.values
+        strings = pa.list_(pa.string())
+        columns = [
+            pa.array(business_ids, pa.int64()),
+            pa.LargeStringArray.from_buffers(
+                count, pa.py_buffer(store.text_offsets), pa.py_buffer(store.text_data)
+            ).cast(pa.string()),
+            pa.array(store.ratings, pa.float64()),
+            pa.array([values[code] for code in store.time_codes], pa.string()),
+            pa.array([values[code] for code in store.positive_codes], strings),
+            pa.array([values[code] for code in store.negative_codes], strings),
+            pa.array([values[code] for code in store.services_codes], strings),
+            pa.array([values[code] for code in store.date_codes], pa.string())
+        ]
+        self.writers[1].write_table(
+            pa.Table.from_arrays(columns, schema=self.schemas[1]),
+            row_group_size=self.BATCH_SIZE
+        )
+
+    def write_business(self, row: list) -> None:
+        self._buffer(0, row)
+
+    def write_review(self, row: list) -> None:
+        self._buffer(1, row)
+
+    def _buffer(self, table: int, row: list) -> None:
+        self.buffers[table].append(row)
+        if len(self.buffers[table]) >= self.BATCH_SIZE:
+            self._flush(table)
+
+    def _flush(self, table: int) -> None:
+        rows = self.buffers[table]
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        self.writers[table].write_table(
+            self.pa.Table.from_arrays([self.pa.array(c, type=f.type) for c, f in zip(columns, self.schemas[table])],
+                                      schema=self.schemas[table])
+        )
+        self.buffers[table] = []
+
+    def close(self) -> None:
+        for table, writer in enumerate(self.writers):
+            self._flush(table)
+            writer.close()
+
+# Output backends selectable with --format
+EXPORTERS = {
+    'xlsx': StreamingWorkbook,
+    'csv': CsvExporter,
+    'jsonl': JsonlExporter,
+    'parquet': ParquetExporter,
+    'sqlite': SqliteExporter
+}
+
+def create_exporter(output_format: str, output_file: str):
+    """Create the exporter for a format; all share add_business and close."""
+    return EXPORTERS[output_format](output_file)
+
+def default_extension(output_format: str) -> str:
+    return EXPORTERS[output_format].extension
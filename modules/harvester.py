@@ -0,0 +1,158 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+import time
+
+from selenium.webdriver.common.by import By
+
+from .const.settings import SELECTORS, SCRAPER_CONFIG, Review
+from .const.scripts import EXTRACT_REVIEWS
+from .network import block_lean_urls
+
+@dataclass
+class _Tab:
+    item: Any
+    handle: str
+    opened: float
+    deadline: float
+    reviews_open: bool = False
+    sorted: bool = False
+
+class ReviewHarvester:
+    """Load the reviews of several businesses at once in background tabs.
+
+    Each business's detail page opens in its own tab of the scraper's
+    driver, so pages load in parallel while the caller keeps working in the
+    results tab. poll() visits every open tab once: it opens the reviews
+    pane once the page is ready, extracts all reviews in one script call
+    once they are loaded, and closes finished tabs. At most `tabs` tabs are
+    open at a time and each one takes a slot from the rate controller.
+    """
+
+    def __init__(self, scraper, tabs: int):
+        self.scraper = scraper
+        self.driver = scraper.driver
+        self.tabs = tabs
+        self.newest_first = scraper.incremental and scraper.cache is not None
+        self.main = self.driver.current_window_handle
+        self.current = self.main  # Tracked here to save a round-trip per switch
+        self.waiting = deque()  # (item, url) not opened yet
+        self.open: List[_Tab] = []
+        self.businesses = 0
+        self.reviews = 0
+        self.busy = 0.0  # Seconds with at least one tab open
+        self.busy_since: Optional[float] = None
+
+    def submit(self, item: Any, url: str) -> None:
+        """Queue a detail page; item is handed back with its reviews."""
+        self.waiting.append((item, url))
+        self._fill()
+        self._switch(self.main)
+
+    def _switch(self, handle: str) -> None:
+        if self.current != handle:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+    def _fill(self) -> None:
+        """Open waiting pages while tabs and rate slots are free."""
+        while self.waiting and len(self.open) < self.tabs and self.scraper.rate.try_acquire():
+            item, url = self.waiting.popleft()
+            self.driver.switch_to.new_window('tab')
+            self.current = self.driver.current_window_handle
+            if SCRAPER_CONFIG['lean']:
+                block_lean_urls(self.driver)
+            # Assigning the location returns at once, unlike driver.get
+            self.driver.execute_script('window.location.href = arguments[0];', url)
+            now = time.monotonic()
+            self.open.append(_Tab(item, self.current, now, now + SCRAPER_CONFIG['page_load_timeout']))
+            if self.busy_since is None:
+                self.busy_since = now
+
+    def _advance(self, tab: _Tab) -> Optional[List[Review]]:
+        """Move a tab one step on; returns its reviews once it is done."""
+        now = time.monotonic()
+        if not tab.reviews_open:
+            reviews_tab = self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['reviews_tab'])
+            if not reviews_tab:
+                if now >= tab.deadline:
+                    raise Exception('Detail page timed out')
+                return None
+            reviews_tab[0].click()
+            tab.reviews_open = True
+            tab.deadline = now + SCRAPER_CONFIG['review_scroll_timeout']
+            return None
+
+        records = self.driver.execute_script(EXTRACT_REVIEWS, SELECTORS)
+        if not records and now < tab.deadline:
+            return None
+        if records and self.newest_first and not tab.sorted:
+            # Incremental runs keep the newest reviews first, as the inline path does
+            tab.sorted = True
+            if self.scraper.sort_reviews_newest():
+                records = self.driver.execute_script(EXTRACT_REVIEWS, SELECTORS)
+
+        reviews = []
+        for record in records:
+            try:
+                reviews.append(self.scraper._build_review(
+                    record['text'], record['rating'], record['time_posted'], record['points'], record['services'],
+                    record['review_id']
+                ))
+            except (ValueError, IndexError):
+                continue  # Incomplete review
+        return reviews
+
+    def _close_tab(self, tab: _Tab, ok: bool) -> None:
+        self.open.remove(tab)
+        self.scraper.rate.release(time.monotonic() - tab.opened, ok)
+        self._switch(tab.handle)
+        self.driver.close()
+        self.current = None
+        if not self.open and self.busy_since is not None:
+            self.busy += time.monotonic() - self.busy_since
+            self.busy_since = None
+
+    def poll(self) -> List[Tuple[Any, List[Review]]]:
+        """Advance every open tab once and return the items that finished."""
+        finished = []
+        for tab in list(self.open):
+            self._switch(tab.handle)
+            try:
+                reviews = self._advance(tab)
+            except Exception as e:
+                print(f'Error getting reviews: {str(e)}')
+                self._close_tab(tab, False)
+                finished.append((tab.item, []))
+                continue
+            if reviews is not None:
+                self._close_tab(tab, True)
+                self.businesses += 1
+                self.reviews += len(reviews)
+                finished.append((tab.item, reviews))
+        self._fill()
+        self._switch(self.main)
+        return finished
+
+    @property
+    def pending(self) -> int:
+        """Submitted pages that are not done yet."""
+        return len(self.open) + len(self.waiting)
+
+    def close(self) -> None:
+        """Close tabs left open, e.g. after an error, and return to the results tab."""
+        for tab in list(self.open):
+            try:
+                self._close_tab(tab, False)
+            except Exception:
+                pass  # Tab or session already gone
+        self.waiting.clear()
+        try:
+            self._switch(self.main)
+        except Exception:
+            pass
+
+    @property
+    def reviews_per_second(self) -> float:
+        busy = self.busy + (time.monotonic() - self.busy_since if self.busy_since is not None else 0)
+        return self.reviews / busy if busy else 0.0
@@ -1,7 +1,27 @@
-import logging
+from datetime import date, timedelta
 from typing import Optional
+import logging
+import re
 import sys
 
+# Compiled once; the batch normalization stage calls these per column
+PHONE_NOISE = re.compile(r'[^\d+]')
+NUMBER = re.compile(r'\d+(?:[.,]\d+)?')
+NON_DIGITS = re.compile(r'\D')
+POINT_PREFIX = re.compile(r'(?:👍|👎|✓) ')
+
+# Relative review times such as "3 weeks ago", "a year ago" or "vor 2 Monaten"
+TIME_AGO = re.compile(
+    r'\b(?:(?P<en_count>a|an|one|\d+)\s+(?P<en_unit>minute|hour|day|week|month|year)s?\s+ago'
+    r'|vor\s+(?P<de_count>einer|einem|\d+)\s+(?P<de_unit>minute|stunde|tag|woche|monat|jahr))',
+    re.IGNORECASE
+)
+TIME_UNIT_DAYS = {
+    'minute': 0, 'hour': 0, 'day': 1, 'week': 7, 'month': 30, 'year': 365,
+    'stunde': 0, 'tag': 1, 'woche': 7, 'monat': 30, 'jahr': 365
+}
+YESTERDAY = re.compile(r'\b(?:yesterday|gestern)\b', re.IGNORECASE)
+
 def setup_logger(verbose: bool = False) -> logging.Logger:
     """Setup and configure logger."""
     logger = logging.getLogger('map_scraper')
@@ -48,7 +68,7 @@ def parse_address(address: str) -> tuple:
 def clean_phone_number(phone: str) -> str:
     """Clean and format phone number."""
     # Remove all non-numeric characters except '+'
-    cleaned = ''.join(c for c in phone if c.isdigit() or c == '+')
+    cleaned = PHONE_NOISE.sub('', phone)
     
     # Ensure it starts with country code
     if not cleaned.startswith('+'):
@@ -67,9 +87,7 @@ def format_review_points(points: list) -> list:
     formatted = []
     for point in points:
         # Remove any prefix indicators
-        point = point.replace('👍 ', '')
-        point = point.replace('👎 ', '')
-        point = point.replace('✓ ', '')
+        point = POINT_PREFIX.sub('', point)
         
         # Capitalize first letter
         if point:
@@ -90,6 +108,37 @@ def validate_rating(rating: float) -> float:
     
     return round(rating_float, 1)
 
+def parse_rating(text: str) -> float:
+    """Parse a rating such as '4.5' or '4,5' and validate it."""
+    match = NUMBER.search(text)
+    if not match:
+        raise ValueError(f'No rating in {text!r}')
+    return validate_rating(float(match.group().replace(',', '.')))
+
+def parse_review_count(text: str) -> int:
+    """Parse a review count such as '(1,234)' or '1.234 reviews'."""
+    digits = NON_DIGITS.sub('', text)
+    if not digits:
+        raise ValueError(f'No review count in {text!r}')
+    return int(digits)
+
+def parse_time_posted(text: str, today: date) -> Optional[date]:
+    """Turn a relative review time into an approximate date; None if unknown."""
+    match = TIME_AGO.search(text)
+    if match:
+        count = match.group('en_count') or match.group('de_count')
+        unit = (match.group('en_unit') or match.group('de_unit')).lower()
+        count = int(count) if count.isdigit() else 1
+        return today - timedelta(days=count * TIME_UNIT_DAYS[unit])
+    if YESTERDAY.search(text):
+        return today - timedelta(days=1)
+    return None
+
+def review_date(time_posted: str) -> Optional[str]:
+    """ISO date of a relative review time as of today, for reviews as they are scraped."""
+    posted = parse_time_posted(time_posted, date.today())
+    return posted.isoformat() if posted else None
+
 def truncate_text(text: str, max_length: int = 32000) -> str:
     """Truncate text to maximum length while preserving words."""
     if len(text) <= max_length:
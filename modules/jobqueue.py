@@ -0,0 +1,401 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import sqlite3
+import threading
+import time
+
+from .cache import business_to_dict, business_from_dict
+from .const.settings import SCRAPER_CONFIG, Business
+
+STATES = ('pending', 'leased', 'done', 'failed')
+
+@dataclass
+class Job:
+    id: str
+    location: str
+    business_type: str
+    max_results: int
+    attempts: int = 0
+
+    @property
+    def query(self) -> str:
+        return f'{self.location} {self.business_type}'.strip()
+
+def job_key(location: str, business_type: str, max_results: int) -> str:
+    """Identity of a job, so queueing the same job twice adds it once."""
+    return f'{location}|{business_type}|{max_results}'
+
+class JobQueue:
+    """Base class for job queues shared by the workers of a distributed run.
+
+    A worker leases a job and must renew the lease with heartbeat() while it
+    scrapes; a lease that runs out hands the job to the next worker. Jobs
+    go back to the queue after a failure or an expired lease until they
+    have been leased SCRAPER_CONFIG['job_max_attempts'] times. complete()
+    only accepts results from the worker that holds the lease, so a job
+    taken over by another worker is not delivered twice. Results stay in
+    the queue in arrival order and are read from a position.
+    """
+
+    def put(self, jobs: Iterable[Tuple[str, str, int]]) -> int:
+        """Queue (location, business_type, max_results) jobs; returns how many were new."""
+        raise NotImplementedError
+
+    def lease(self, worker: str, seconds: float) -> Optional[Job]:
+        """Take the next pending job for seconds, or None if there is none."""
+        raise NotImplementedError
+
+    def heartbeat(self, job: Job, worker: str, seconds: float) -> bool:
+        """Extend a lease; returns False if the worker no longer holds it."""
+        raise NotImplementedError
+
+    def complete(self, job: Job, worker: str, businesses: List[Business]) -> bool:
+        """Store a job's results; returns False if the worker no longer holds its lease."""
+        raise NotImplementedError
+
+    def fail(self, job: Job, worker: str, error: str) -> None:
+        """Give up a lease after an error, queueing the job again if it has attempts left."""
+        raise NotImplementedError
+
+    def requeue_expired(self) -> int:
+        """Queue jobs whose lease ran out again; returns how many were found."""
+        raise NotImplementedError
+
+    def read_results(self, position: int = 0) -> Tuple[int, List[Business]]:
+        """Return the position after the last result and the businesses since position."""
+        raise NotImplementedError
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+        raise NotImplementedError
+
+    def failures(self) -> List[Tuple[str, str]]:
+        """(query, error) of every job that ran out of attempts."""
+        raise NotImplementedError
+
+    def drained(self) -> bool:
+        """Whether no job is pending or leased any more."""
+        counts = self.counts()
+        return not counts['pending'] and not counts['leased']
+
+    def close(self) -> None:
+        pass
+
+class SqliteJobQueue(JobQueue):
+    """Job queue in a SQLite file that every worker can open.
+
+    Leases are taken in an immediate transaction, so processes on one host
+    or on hosts sharing the file never lease the same job.
+    """
+
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        # Autocommit mode; transactions are opened explicitly
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, location TEXT NOT NULL, '
+            'business_type TEXT NOT NULL, max_results INTEGER NOT NULL, state TEXT NOT NULL, '
+            'worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0, error TEXT)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id)')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'id INTEGER PRIMARY KEY, job_id INTEGER NOT NULL, data TEXT NOT NULL)'
+        )
+
+    def _transaction(self, work):
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = work()
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+            return result
+
+    def put(self, jobs: Iterable[Tuple[str, str, int]]) -> int:
+        def work() -> int:
+            added = 0
+            for location, business_type, max_results in jobs:
+                cursor = self.conn.execute(
+                    'INSERT OR IGNORE INTO jobs (key, location, business_type, max_results, state) '
+                    "VALUES (?, ?, ?, ?, 'pending')",
+                    (job_key(location, business_type, max_results), location, business_type, max_results)
+                )
+                added += cursor.rowcount
+            return added
+        return self._transaction(work)
+
+    def _requeue_expired(self) -> int:
+        now = time.time()
+        failed = self.conn.execute(
+            "UPDATE jobs SET state = 'failed', worker = NULL, error = 'Lease expired' "
+            "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, SCRAPER_CONFIG['job_max_attempts'])
+        ).rowcount
+        requeued = self.conn.execute(
+            "UPDATE jobs SET state = 'pending', worker = NULL WHERE state = 'leased' AND lease_until < ?",
+            (now,)
+        ).rowcount
+        return failed + requeued
+
+    def requeue_expired(self) -> int:
+        return self._transaction(self._requeue_expired)
+
+    def lease(self, worker: str, seconds: float) -> Optional[Job]:
+        def work() -> Optional[Job]:
+            self._requeue_expired()
+            row = self.conn.execute(
+                "SELECT id, location, business_type, max_results, attempts FROM jobs "
+                "WHERE state = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (worker, time.time() + seconds, row[0])
+            )
+            return Job(str(row[0]), row[1], row[2], row[3], row[4] + 1)
+        return self._transaction(work)
+
+    def heartbeat(self, job: Job, worker: str, seconds: float) -> bool:
+        with self.lock:
+            return self.conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (time.time() + seconds, int(job.id), worker)
+            ).rowcount == 1
+
+    def complete(self, job: Job, worker: str, businesses: List[Business]) -> bool:
+        def work() -> bool:
+            if not self.conn.execute(
+                "UPDATE jobs SET state = 'done', worker = NULL, error = NULL "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                (int(job.id), worker)
+            ).rowcount:
+                return False
+            self.conn.executemany(
+                'INSERT INTO results (job_id, data) VALUES (?, ?)',
+                [(int(job.id), json.dumps(business_to_dict(business))) for business in businesses]
+            )
+            return True
+        return self._transaction(work)
+
+    def fail(self, job: Job, worker: str, error: str) -> None:
+        def work() -> None:
+            self.conn.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, error = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (SCRAPER_CONFIG['job_max_attempts'], error, int(job.id), worker)
+            )
+        self._transaction(work)
+
+    def read_results(self, position: int = 0) -> Tuple[int, List[Business]]:
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT id, data FROM results WHERE id > ? ORDER BY id', (position,)
+            ).fetchall()
+        if not rows:
+            return position, []
+        return rows[-1][0], [business_from_dict(json.loads(data)) for _, data in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(rows)
+        return counts
+
+    def failures(self) -> List[Tuple[str, str]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT location, business_type, error FROM jobs WHERE state = 'failed' ORDER BY id"
+            ).fetchall()
+        return [(f'{location} {business_type}'.strip(), error) for location, business_type, error in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
+class RedisJobQueue(JobQueue):
+    """Job queue on a Redis-compatible server, for workers spread over hosts.
+
+    Takes a client created with decode_responses=True. Pending job ids
+    sit in a list, leases in a sorted set scored by expiry, and finished
+    and failed ids in sets. Every change to a job is a MULTI/EXEC
+    transaction guarded by WATCH on the job, so only plain commands are
+    needed and any server or stand-in that speaks them will do.
+    """
+
+    def __init__(self, client, prefix: str = 'mapscraper'):
+        from redis.exceptions import WatchError
+
+        self.redis = client
+        self.WatchError = WatchError
+        self.prefix = prefix
+        self.pending = f'{prefix}:pending'
+        self.leases = f'{prefix}:leases'
+        self.done = f'{prefix}:done'
+        self.failed = f'{prefix}:failed'
+        self.keys = f'{prefix}:keys'
+        self.results = f'{prefix}:results'
+
+    def _job_key(self, job_id: str) -> str:
+        return f'{self.prefix}:job:{job_id}'
+
+    def _update(self, job_id: str, work) -> Optional[object]:
+        """Run work(pipe, job) on a watched job and retry when the job changed meanwhile.
+
+        work queues its commands after calling pipe.multi() and returns a
+        value, or returns without calling multi() to leave the job as is.
+        """
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self._job_key(job_id))
+                    result = work(pipe, pipe.hgetall(self._job_key(job_id)))
+                    if pipe.explicit_transaction:
+                        pipe.execute()
+                    else:
+                        pipe.unwatch()
+                    return result
+                except self.WatchError:
+                    continue
+
+    def put(self, jobs: Iterable[Tuple[str, str, int]]) -> int:
+        added = 0
+        for location, business_type, max_results in jobs:
+            key = job_key(location, business_type, max_results)
+            with self.redis.pipeline() as pipe:
+                while True:
+                    try:
+                        pipe.watch(self.keys)
+                        if pipe.hexists(self.keys, key):
+                            pipe.unwatch()
+                            break
+                        job_id = str(pipe.incr(f'{self.prefix}:next_id'))
+                        pipe.multi()
+                        pipe.hset(self.keys, key, job_id)
+                        pipe.hset(self._job_key(job_id), mapping={
+                            'location': location, 'business_type': business_type,
+                            'max_results': max_results, 'attempts': 0
+                        })
+                        pipe.lpush(self.pending, job_id)
+                        pipe.execute()
+                        added += 1
+                        break
+                    except self.WatchError:
+                        continue
+        return added
+
+    def requeue_expired(self) -> int:
+        found = 0
+        for job_id in self.redis.zrangebyscore(self.leases, '-inf', time.time()):
+            def work(pipe, job) -> int:
+                lease_until = pipe.zscore(self.leases, job_id)
+                if lease_until is None or lease_until >= time.time():
+                    return 0  # Renewed or finished meanwhile
+                pipe.multi()
+                pipe.zrem(self.leases, job_id)
+                pipe.hdel(self._job_key(job_id), 'worker')
+                if int(job['attempts']) >= SCRAPER_CONFIG['job_max_attempts']:
+                    pipe.hset(self._job_key(job_id), 'error', 'Lease expired')
+                    pipe.sadd(self.failed, job_id)
+                else:
+                    pipe.rpush(self.pending, job_id)  # Next in line
+                return 1
+            found += self._update(job_id, work)
+        return found
+
+    def lease(self, worker: str, seconds: float) -> Optional[Job]:
+        self.requeue_expired()
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.pending)
+                    job_id = pipe.lindex(self.pending, -1)
+                    if job_id is None:
+                        pipe.unwatch()
+                        return None
+                    pipe.multi()
+                    pipe.rpop(self.pending)
+                    pipe.zadd(self.leases, {job_id: time.time() + seconds})
+                    pipe.hset(self._job_key(job_id), 'worker', worker)
+                    pipe.hincrby(self._job_key(job_id), 'attempts', 1)
+                    pipe.hgetall(self._job_key(job_id))
+                    job = pipe.execute()[-1]
+                    return Job(job_id, job['location'], job['business_type'],
+                               int(job['max_results']), int(job['attempts']))
+                except self.WatchError:
+                    continue
+
+    def heartbeat(self, job: Job, worker: str, seconds: float) -> bool:
+        def work(pipe, current) -> bool:
+            if current.get('worker') != worker:
+                return False
+            pipe.multi()
+            pipe.zadd(self.leases, {job.id: time.time() + seconds}, xx=True)
+            pipe.hset(self._job_key(job.id), 'renewed', time.time())  # Conflicts with a concurrent requeue
+            return True
+        return self._update(job.id, work)
+
+    def complete(self, job: Job, worker: str, businesses: List[Business]) -> bool:
+        def work(pipe, current) -> bool:
+            if current.get('worker') != worker:
+                return False
+            pipe.multi()
+            pipe.zrem(self.leases, job.id)
+            pipe.hdel(self._job_key(job.id), 'worker', 'error')
+            pipe.sadd(self.done, job.id)
+            if businesses:
+                pipe.rpush(self.results, *[json.dumps(business_to_dict(b)) for b in businesses])
+            return True
+        return self._update(job.id, work)
+
+    def fail(self, job: Job, worker: str, error: str) -> None:
+        def work(pipe, current) -> None:
+            if current.get('worker') != worker:
+                return
+            pipe.multi()
+            pipe.zrem(self.leases, job.id)
+            pipe.hdel(self._job_key(job.id), 'worker')
+            pipe.hset(self._job_key(job.id), 'error', error)
+            if int(current['attempts']) >= SCRAPER_CONFIG['job_max_attempts']:
+                pipe.sadd(self.failed, job.id)
+            else:
+                pipe.lpush(self.pending, job.id)
+        self._update(job.id, work)
+
+    def read_results(self, position: int = 0) -> Tuple[int, List[Business]]:
+        items = self.redis.lrange(self.results, position, -1)
+        return position + len(items), [business_from_dict(json.loads(item)) for item in items]
+
+    def counts(self) -> Dict[str, int]:
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.llen(self.pending)
+            pipe.zcard(self.leases)
+            pipe.scard(self.done)
+            pipe.scard(self.failed)
+            return dict(zip(STATES, pipe.execute()))
+
+    def failures(self) -> List[Tuple[str, str]]:
+        failures = []
+        for job_id in sorted(self.redis.smembers(self.failed), key=int):
+            job = self.redis.hgetall(self._job_key(job_id))
+            failures.append((f'{job["location"]} {job["business_type"]}'.strip(), job.get('error')))
+        return failures
+
+    def close(self) -> None:
+        self.redis.close()
+
+def open_queue(location: str) -> JobQueue:
+    """Open a redis:// (or rediss://, unix://) URL as a RedisJobQueue, anything else as a SQLite file."""
+    if location.startswith(('redis://', 'rediss://', 'unix://')):
+        try:
+            import redis
+        except ImportError:
+            raise Exception('A Redis job queue requires redis (pip install redis)')
+        return RedisJobQueue(redis.Redis.from_url(location, decode_responses=True))
+    return SqliteJobQueue(location)
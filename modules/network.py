@@ -0,0 +1,192 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from typing import List, Optional
+import json
+
+from .helpers import parse_address, review_date
+from .const.settings import RESPONSE_URLS, RESPONSE_PATHS, LEAN_BLOCKED_URLS, Business, Review
+
+# Maps prefixes JSON responses with this guard against JSON hijacking
+XSSI_PREFIX = ")]}'"
+# and search responses with this trailing comment
+TRAILING_COMMENT = '/*""*/'
+
+def enable_performance_log(options: Options) -> None:
+    """Make Chrome record network events in the performance log."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+def block_lean_urls(driver: webdriver.Chrome) -> None:
+    """Block LEAN_BLOCKED_URLS in the current tab.
+
+    CDP network settings only apply to the tab they are sent to, so lean
+    mode calls this for the first tab and again for every tab opened later.
+    """
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+
+def decode_response(body: str):
+    """Strip the XSSI guard and trailing comment and decode a response, unwrapping a nested 'd' payload."""
+    body = body.strip()
+    if body.endswith(TRAILING_COMMENT):
+        body = body[:-len(TRAILING_COMMENT)]
+    if body.startswith(XSSI_PREFIX):
+        body = body[len(XSSI_PREFIX):]
+    data = json.loads(body)
+
+    if isinstance(data, dict) and 'd' in data:
+        return decode_response(data['d'])
+    return data
+
+def _path(data, path: list):
+    """Follow an index path into nested lists, returning None where it breaks off."""
+    for index in path:
+        try:
+            data = data[index]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+def parse_search_response(body: str) -> List[Business]:
+    """Parse a search XHR response into businesses, skipping entries that don't fit."""
+    results = _path(decode_response(body), RESPONSE_PATHS['results'])
+    if not isinstance(results, list):
+        return []
+
+    businesses = []
+    for result in results:
+        place = _path(result, RESPONSE_PATHS['place'])
+        name = _path(place, RESPONSE_PATHS['name'])
+        address = _path(place, RESPONSE_PATHS['address'])
+        if not name or not address:
+            continue
+
+        try:
+            street_address, postal_code, city = parse_address(address)
+        except ValueError:
+            continue
+
+        businesses.append(Business(
+            name=name,
+            street_address=street_address,
+            postal_code=postal_code,
+            city=city,
+            phone=_path(place, RESPONSE_PATHS['phone']),
+            website=_path(place, RESPONSE_PATHS['website']),
+            avg_rating=float(_path(place, RESPONSE_PATHS['rating']) or 0),
+            num_ratings=int(_path(place, RESPONSE_PATHS['review_count']) or 0),
+            reviews=[]
+        ))
+
+    return businesses
+
+def parse_reviews_response(body: str) -> List[Review]:
+    """Parse a reviews XHR response into reviews, skipping entries that don't fit."""
+    entries = _path(decode_response(body), RESPONSE_PATHS['reviews'])
+    if not isinstance(entries, list):
+        return []
+
+    reviews = []
+    for entry in entries:
+        rating = _path(entry, RESPONSE_PATHS['review_rating'])
+        if rating is None:
+            continue
+
+        time_posted = _path(entry, RESPONSE_PATHS['review_time']) or ''
+        reviews.append(Review(
+            text=_path(entry, RESPONSE_PATHS['review_text']) or '',
+            rating=float(rating),
+            time_posted=time_posted,
+            date_posted=review_date(time_posted),
+            review_id=_path(entry, RESPONSE_PATHS['review_id'])
+        ))
+
+    return reviews
+
+class ResponseCapture:
+    """Collect search and review XHR bodies from Chrome's performance log.
+
+    A body is only fetched once Network.loadingFinished has been logged for
+    its request, so a response still in flight is never read half done or
+    picked up later by the wrong caller. begin() marks the start of an
+    interaction such as opening a reviews pane: responses of that kind
+    logged or pending before it are dropped.
+    """
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.pending = {}  # request_id -> kind, waiting for loadingFinished
+        self.finished = []  # [(kind, request_id)] ready to fetch
+        self.captured = {kind: [] for kind in RESPONSE_URLS}
+
+    def _read_log(self) -> None:
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.responseReceived':
+                url = params['response']['url']
+                for kind, fragment in RESPONSE_URLS.items():
+                    if fragment in url:
+                        self.pending[params['requestId']] = kind
+            elif method == 'Network.loadingFinished':
+                kind = self.pending.pop(params['requestId'], None)
+                if kind:
+                    self.finished.append((kind, params['requestId']))
+            elif method == 'Network.loadingFailed':
+                self.pending.pop(params['requestId'], None)
+
+    def drain(self) -> None:
+        """Fetch the bodies of matching responses that finished loading since the last call."""
+        self._read_log()
+        for kind, request_id in self.finished:
+            body = self._body(request_id)
+            if body is not None:
+                self.captured[kind].append(body)
+        self.finished = []
+
+    def _body(self, request_id: str) -> Optional[str]:
+        try:
+            return self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})['body']
+        except Exception:
+            return None
+
+    def _take(self, kind: str) -> List[str]:
+        self.drain()
+        bodies = self.captured[kind]
+        self.captured[kind] = []
+        return bodies
+
+    def begin(self, kind: str) -> None:
+        """Drop responses of a kind so the next take only sees those triggered from now on."""
+        self._read_log()
+        self.pending = {request_id: k for request_id, k in self.pending.items() if k != kind}
+        self.finished = [(k, request_id) for k, request_id in self.finished if k != kind]
+        self.captured[kind] = []
+
+    def businesses(self) -> List[Business]:
+        """Businesses from search responses captured since the last call."""
+        businesses = []
+        for body in self._take('search'):
+            try:
+                businesses.extend(parse_search_response(body))
+            except (ValueError, TypeError):
+                continue
+        return businesses
+
+    def reviews(self) -> List[Review]:
+        """Reviews from review responses captured since the last call."""
+        reviews = []
+        for body in self._take('reviews'):
+            try:
+                reviews.extend(parse_reviews_response(body))
+            except (ValueError, TypeError):
+                continue
+        return reviews
+
+    def clear(self) -> None:
+        """Discard everything logged so far without fetching any bodies."""
+        self.driver.get_log('performance')
+        self.pending = {}
+        self.finished = []
+        self.captured = {kind: [] for kind in RESPONSE_URLS}
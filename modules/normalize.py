@@ -0,0 +1,116 @@
+from dataclasses import replace
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .helpers import (
+    clean_phone_number,
+    format_review_points,
+    parse_address,
+    parse_rating,
+    parse_review_count,
+    parse_time_posted,
+    truncate_text,
+    validate_rating
+)
+from .const.settings import Business
+
+def map_unique(values: list, func: Callable) -> list:
+    """Apply func to a column once per distinct value; None and failures map to None.
+
+    Phones, postal areas, ratings and time phrases repeat heavily across a
+    result set, so each distinct value is parsed only once.
+    """
+    results: Dict = {None: None}
+    for value in set(values):
+        if value not in results:
+            try:
+                results[value] = func(value)
+            except ValueError:
+                results[value] = None
+    return [results[value] for value in values]
+
+def split_address(address: str) -> Tuple[str, str, str]:
+    """Parse an address, keeping it whole as the street when it has no postal part."""
+    try:
+        return parse_address(address)
+    except ValueError:
+        return address.strip(), '', ''
+
+def build_businesses(records: List[dict]) -> List[Optional[Business]]:
+    """Build businesses from raw card fields, parsing each field column by column.
+
+    Entries are None where a required field is missing or does not parse.
+    """
+    addresses = map_unique([r['address'] or None for r in records], split_address)
+    ratings = map_unique([r['rating'] for r in records], parse_rating)
+    counts = map_unique([r['review_count'] for r in records], parse_review_count)
+
+    businesses = []
+    for record, address, rating, count in zip(records, addresses, ratings, counts):
+        if not record['name'] or address is None or rating is None or count is None:
+            businesses.append(None)
+            continue
+
+        street_address, postal_code, city = address
+        businesses.append(Business(
+            name=record['name'],
+            street_address=street_address,
+            postal_code=postal_code,
+            city=city,
+            phone=record['phone'],
+            website=record['website'],
+            avg_rating=rating,
+            num_ratings=count,
+            reviews=[]
+        ))
+    return businesses
+
+def normalize_businesses(businesses: List[Business], today: Optional[date] = None) -> List[Business]:
+    """Normalize a batch of businesses and their reviews column by column.
+
+    Phones get a country code, ratings are validated (invalid ones become
+    None), review points lose their icons and review texts are cut to what
+    an Excel cell holds. Reviews are dated when they are scraped, since
+    cached ones can be weeks old by export; only reviews without a date get
+    one relative to today.
+    """
+    today = today or date.today()
+
+    phones = map_unique([b.phone for b in businesses], clean_phone_number)
+    ratings = map_unique([b.avg_rating for b in businesses], validate_rating)
+
+    reviews = [review for business in businesses for review in business.reviews]
+    dates = map_unique(
+        [review.time_posted if review.date_posted is None else None for review in reviews],
+        lambda text: parse_time_posted(text, today)
+    )
+    review_ratings = map_unique([review.rating for review in reviews], validate_rating)
+    positive = map_unique([review.positive_points for review in reviews], format_review_points)
+    negative = map_unique([review.negative_points for review in reviews], format_review_points)
+    texts = [truncate_text(review.text) for review in reviews]
+
+    normalized_reviews = [
+        replace(
+            review,
+            text=text,
+            rating=rating,
+            positive_points=positive_points,
+            negative_points=negative_points,
+            date_posted=review.date_posted or (date_posted.isoformat() if date_posted else None)
+        )
+        for review, text, rating, positive_points, negative_points, date_posted
+        in zip(reviews, texts, review_ratings, positive, negative, dates)
+    ]
+
+    normalized = []
+    start = 0
+    for business, phone, rating in zip(businesses, phones, ratings):
+        end = start + len(business.reviews)
+        normalized.append(replace(
+            business,
+            phone=phone,
+            avg_rating=rating,
+            reviews=normalized_reviews[start:end]
+        ))
+        start = end
+    return normalized
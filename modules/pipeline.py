@@ -0,0 +1,110 @@
+from typing import Optional
+import queue
+import threading
+
+from .profiler import NULL_PROFILER, Profiler
+from .normalize import normalize_businesses
+from .reviewstore import ReviewStore
+from .const.settings import SCRAPER_CONFIG, Business
+
+# Marks the end of the stream for the writer thread
+_DONE = object()
+
+class ExportPipeline:
+    """Hand businesses to an exporter running on its own writer thread.
+
+    The queue is bounded, so a slow writer blocks the scrapers (backpressure)
+    instead of letting results pile up in memory. The writer takes whatever
+    is queued, up to SCRAPER_CONFIG['normalize_batch_size'] businesses, as
+    one batch, so normalization can run column-wise over it. With columnar
+    set, batches are collected in a ReviewStore and written with add_store
+    once it holds SCRAPER_CONFIG['columnar_flush_reviews'] reviews and at
+    the end, so reviews waiting for the writer take a fraction of the
+    memory and Parquet gets large row groups. A writer error
+    is raised on the next put or on close, and close always flushes and
+    closes the exporter.
+    """
+
+    def __init__(self, exporter, profiler: Optional[Profiler] = None, normalize: bool = False,
+                 columnar: bool = False):
+        self.exporter = exporter
+        self.profiler = profiler or NULL_PROFILER
+        self.normalize = normalize
+        self.store = ReviewStore() if columnar else None
+        self.queue = queue.Queue(maxsize=SCRAPER_CONFIG['export_queue_size'])
+        self.count = 0
+        self.count_lock = threading.Lock()
+        self.error = None
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def _next_batch(self) -> list:
+        """Wait for a business and take whatever else is already queued."""
+        batch = [self.queue.get()]
+        while batch[-1] is not _DONE and len(batch) < SCRAPER_CONFIG['normalize_batch_size']:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self) -> None:
+        done = False
+        try:
+            while not done:
+                batch = self._next_batch()
+                if batch[-1] is _DONE:
+                    done = True
+                    batch.pop()
+                if not batch:
+                    continue
+                if self.normalize:
+                    with self.profiler.stage('normalize'):
+                        batch = normalize_businesses(batch)
+                if self.store is not None:
+                    for business in batch:
+                        self.store.add(business)
+                    if len(self.store) >= SCRAPER_CONFIG['columnar_flush_reviews']:
+                        self._flush_store()
+                    continue
+                with self.profiler.stage('export'):
+                    for business in batch:
+                        self.exporter.add_business(business)
+            if self.store is not None:
+                self._flush_store()
+        except Exception as e:
+            self.error = e
+            # Keep draining so producers blocked on a full queue are released
+            while not done:
+                done = self.queue.get() is _DONE
+        finally:
+            try:
+                self.exporter.close()
+            except Exception as e:
+                self.error = self.error or e
+
+    def _flush_store(self) -> None:
+        with self.profiler.stage('export'):
+            self.exporter.add_store(self.store)
+        self.store = ReviewStore()
+
+    def put(self, business: Business) -> None:
+        """Queue a business for writing; blocks while the queue is full."""
+        if self.error:
+            raise Exception(f'Export failed: {str(self.error)}')
+        self.queue.put(business)
+        with self.count_lock:
+            self.count += 1
+
+    def close(self) -> None:
+        """Wait for every queued business to be written and close the exporter."""
+        self.queue.put(_DONE)
+        self.thread.join()
+        if self.error:
+            raise Exception(f'Export failed: {str(self.error)}')
+
+    def __enter__(self) -> 'ExportPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,192 @@
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+import queue
+import threading
+
+from selenium import webdriver
+
+from .scraper import GoogleMapsScraper
+from .helpers import print_colored
+from .const.colors import Colors
+from .const.settings import SCRAPER_CONFIG
+
+class DriverPool:
+    """Pre-launched drivers that are handed out per query and reused.
+
+    Drivers are started in parallel and warmed up on Maps with the consent
+    dialog accepted, so a query starts on a browser that already has the
+    page's scripts and cookies. A driver is health-checked before it is
+    handed out and replaced when its session is gone; it is also recycled
+    after SCRAPER_CONFIG['driver_max_queries'] queries or once its JS heap
+    passes SCRAPER_CONFIG['driver_max_memory_mb'].
+
+    Each driver holds one of size slots, and the factory is called with the
+    slot number. A replacement is launched into the slot of the driver it
+    replaces once that one has quit, so it can reuse the slot's profile.
+    """
+
+    def __init__(self, driver_factory: Callable[[int], webdriver.Chrome], size: int):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.idle = queue.Queue()
+        self.live: Dict[int, webdriver.Chrome] = {}  # Every running driver, idle or borrowed
+        self.uses: Dict[int, int] = {}
+        self.slots: Dict[int, int] = {}  # Driver id -> slot
+        self.lock = threading.Lock()
+        self.closed = False
+        self.replaced = 0
+        self.recycled = 0
+
+        errors = []
+
+        def launch(slot: int) -> None:
+            try:
+                self.idle.put(self._launch(slot))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=launch, args=(slot,), daemon=True) for slot in range(size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            self.close()
+            raise Exception(f'Failed to start driver pool: {str(errors[0])}')
+
+    def _launch(self, slot: int) -> webdriver.Chrome:
+        """Start a driver for a slot and warm it up on Maps."""
+        driver = self.driver_factory(slot)
+        try:
+            driver.get(SCRAPER_CONFIG['maps_url'])
+            GoogleMapsScraper(driver).accept_consent()
+        except Exception:
+            driver.quit()
+            raise
+        if self.closed:
+            driver.quit()
+            raise Exception('Driver pool is closed')
+        with self.lock:
+            self.live[id(driver)] = driver
+            self.uses[id(driver)] = 0
+            self.slots[id(driver)] = slot
+        return driver
+
+    def _slot(self, driver: webdriver.Chrome) -> int:
+        with self.lock:
+            return self.slots.get(id(driver), getattr(driver, 'slot', None))
+
+    def _retire(self, driver: webdriver.Chrome) -> int:
+        """Quit a driver and return its slot, free for a replacement."""
+        slot = self._slot(driver)
+        with self.lock:
+            self.live.pop(id(driver), None)
+            self.uses.pop(id(driver), None)
+            self.slots.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Session already gone
+        return slot
+
+    def is_healthy(self, driver: webdriver.Chrome) -> bool:
+        """Whether the driver's session still answers commands."""
+        try:
+            return driver.execute_script('return 1;') == 1
+        except Exception:
+            return False
+
+    def _memory_mb(self, driver: webdriver.Chrome) -> float:
+        heap = driver.execute_script('return performance.memory ? performance.memory.usedJSHeapSize : 0;')
+        return (heap or 0) / (1024 * 1024)
+
+    def acquire(self) -> webdriver.Chrome:
+        """Take a healthy driver, replacing a dead one transparently."""
+        driver = self.idle.get()
+        slot = self._slot(driver)
+        try:
+            return self.recover(driver)
+        except Exception:
+            # Keep the pool at full size for the next caller to retry
+            self.idle.put(_DeadDriver(slot))
+            raise
+
+    def recover(self, driver: webdriver.Chrome) -> webdriver.Chrome:
+        """Return the driver if its session is alive, else a fresh warmed-up one."""
+        if self.is_healthy(driver):
+            return driver
+
+        print_colored('Replacing crashed driver', Colors.YELLOW)
+        slot = self._retire(driver)
+        with self.lock:
+            self.replaced += 1
+        return self._launch(slot)
+
+    @contextmanager
+    def scraper(self, *args, **kwargs) -> Iterator[GoogleMapsScraper]:
+        """Borrow a driver wrapped in a scraper that replaces it if it crashes.
+
+        Takes GoogleMapsScraper's arguments after the driver. The driver goes
+        back to the pool afterwards, or its replacement if it crashed mid-query.
+        """
+        driver = self.acquire()
+        scraper = None
+        try:
+            scraper = GoogleMapsScraper(driver, *args, recover=self.recover, **kwargs)
+            yield scraper
+        finally:
+            self.release(scraper.driver if scraper is not None else driver)
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        """Return a driver, recycling it when it is worn out or dead."""
+        if self.closed:
+            self._retire(driver)
+            return
+
+        with self.lock:
+            uses = self.uses.get(id(driver), 0) + 1
+            self.uses[id(driver)] = uses
+
+        try:
+            worn = (uses >= SCRAPER_CONFIG['driver_max_queries']
+                    or self._memory_mb(driver) > SCRAPER_CONFIG['driver_max_memory_mb'])
+        except Exception:
+            worn = False  # Dead; acquire replaces it
+
+        if worn:
+            slot = self._retire(driver)
+            with self.lock:
+                self.recycled += 1
+            try:
+                driver = self._launch(slot)
+            except Exception as e:
+                print_colored(f'Failed to relaunch driver: {str(e)}', Colors.YELLOW)
+                driver = _DeadDriver(slot)
+        self.idle.put(driver)
+
+    def close(self) -> None:
+        """Quit every driver, including those still borrowed."""
+        self.closed = True
+        with self.lock:
+            drivers = list(self.live.values())
+        for driver in drivers:
+            self._retire(driver)
+
+    def __enter__(self) -> 'DriverPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+class _DeadDriver:
+    """Placeholder for a driver that failed to relaunch; fails its health check."""
+
+    def __init__(self, slot: int):
+        self.slot = slot
+
+    def execute_script(self, *args):
+        raise Exception('Driver is not running')
+
+    def quit(self) -> None:
+        pass
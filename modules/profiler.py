@@ -0,0 +1,174 @@
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from selenium import webdriver
+import json
+import threading
+import time
+
+class Profiler:
+    """Count and time WebDriver commands per stage and per business.
+
+    Every WebDriver command, including element methods such as click, goes
+    through driver.execute, so wrapping that single method sees all of them.
+    Stages and businesses are tracked per thread for batch workers.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.commands = defaultdict(lambda: [0, 0.0])  # (stage, command) -> [calls, seconds]
+        self.stages = defaultdict(lambda: [0, 0.0])  # stage -> [runs, seconds]
+        self.businesses = defaultdict(lambda: [0, 0.0])  # business -> [calls, seconds]
+        self.rate = {}  # Last rate controller state
+
+    def wrap(self, driver: webdriver.Chrome) -> webdriver.Chrome:
+        """Instrument a driver in place and return it."""
+        execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self._record(driver_command, time.perf_counter() - start)
+
+        driver.execute = timed_execute
+        return driver
+
+    def _record(self, command: str, elapsed: float) -> None:
+        stages = getattr(self.local, 'stages', None)
+        stage = stages[-1] if stages else 'other'
+        business = getattr(self.local, 'business', None)
+
+        with self.lock:
+            entry = self.commands[(stage, command)]
+            entry[0] += 1
+            entry[1] += elapsed
+            if business is not None:
+                entry = self.businesses[business]
+                entry[0] += 1
+                entry[1] += elapsed
+
+    @contextmanager
+    def stage(self, name: str):
+        """Attribute commands issued inside the block to a stage."""
+        if not hasattr(self.local, 'stages'):
+            self.local.stages = []
+        self.local.stages.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.local.stages.pop()
+            with self.lock:
+                entry = self.stages[name]
+                entry[0] += 1
+                entry[1] += elapsed
+
+    @contextmanager
+    def business(self, name: str):
+        """Attribute commands issued inside the block to a business."""
+        previous = getattr(self.local, 'business', None)
+        self.local.business = name
+        try:
+            yield
+        finally:
+            self.local.business = previous
+
+    def record_rate(self, state: dict) -> None:
+        """Store the rate controller state to report with the other metrics."""
+        with self.lock:
+            self.rate = dict(state)
+
+    @property
+    def total_calls(self) -> int:
+        with self.lock:
+            return sum(calls for calls, _ in self.commands.values())
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                'stages': {
+                    name: {'runs': runs, 'seconds': round(seconds, 4)}
+                    for name, (runs, seconds) in self.stages.items()
+                },
+                'commands': [
+                    {'stage': stage, 'command': command, 'calls': calls, 'seconds': round(seconds, 4)}
+                    for (stage, command), (calls, seconds) in sorted(self.commands.items())
+                ],
+                'businesses': {
+                    name: {'calls': calls, 'seconds': round(seconds, 4)}
+                    for name, (calls, seconds) in self.businesses.items()
+                },
+                'rate': dict(self.rate)
+            }
+
+    def summary(self) -> str:
+        """Summary table of stage wall time and WebDriver calls per stage and command."""
+        data = self.to_dict()
+        lines = [f'{"Stage":<28} {"Runs":>6} {"Seconds":>10}']
+        for name, stage in data['stages'].items():
+            lines.append(f'{name:<28} {stage["runs"]:>6} {stage["seconds"]:>10.3f}')
+
+        lines.append('')
+        lines.append(f'{"Stage":<28} {"Command":<24} {"Calls":>7} {"Seconds":>10}')
+        for entry in data['commands']:
+            lines.append(
+                f'{entry["stage"]:<28} {entry["command"]:<24} {entry["calls"]:>7} {entry["seconds"]:>10.3f}'
+            )
+
+        if data['rate']:
+            lines.append('')
+            lines.append(' '.join(f'{name}={value}' for name, value in data['rate'].items()))
+        return '\n'.join(lines)
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_prometheus(self, path: str) -> None:
+        """Write metrics in the Prometheus node exporter textfile format."""
+        data = self.to_dict()
+        lines = [
+            '# HELP map_scraper_stage_seconds Wall time spent per scraping stage.',
+            '# TYPE map_scraper_stage_seconds gauge'
+        ]
+        for name, stage in data['stages'].items():
+            lines.append(f'map_scraper_stage_seconds{{stage="{name}"}} {stage["seconds"]}')
+
+        lines.append('# HELP map_scraper_webdriver_calls WebDriver commands issued.')
+        lines.append('# TYPE map_scraper_webdriver_calls counter')
+        for entry in data['commands']:
+            lines.append(
+                f'map_scraper_webdriver_calls{{stage="{entry["stage"]}",command="{entry["command"]}"}} {entry["calls"]}'
+            )
+
+        lines.append('# HELP map_scraper_webdriver_seconds Time spent in WebDriver commands.')
+        lines.append('# TYPE map_scraper_webdriver_seconds counter')
+        for entry in data['commands']:
+            lines.append(
+                f'map_scraper_webdriver_seconds{{stage="{entry["stage"]}",command="{entry["command"]}"}} {entry["seconds"]}'
+            )
+
+        for name, value in data['rate'].items():
+            lines.append(f'# HELP map_scraper_rate_{name} Rate controller {name.replace("_", " ")}.')
+            lines.append(f'# TYPE map_scraper_rate_{name} gauge')
+            lines.append(f'map_scraper_rate_{name} {value}')
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+class NullProfiler:
+    """Profiler stand-in used when profiling is off; every hook is a no-op."""
+
+    def wrap(self, driver: webdriver.Chrome) -> webdriver.Chrome:
+        return driver
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def business(self, name: str):
+        return nullcontext()
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,150 @@
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+import asyncio
+import random
+import threading
+import time
+
+from .const.settings import SCRAPER_CONFIG
+
+class RateController:
+    """Token bucket plus concurrency limit, both tuned by AIMD.
+
+    Every page operation takes a token and a concurrency slot. Fast
+    successes raise the rate and the limit additively; failures, slow
+    responses and throttling pages cut both multiplicatively. All scraper
+    instances of a run share one controller.
+    """
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float,
+                 max_concurrency: int, latency_target: float):
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.limit = float(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self.throttles = 0
+        self.condition = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.tokens + (now - self.updated) * self.rate, max(self.rate, 1.0))
+        self.updated = now
+
+    def acquire(self) -> None:
+        """Block until a token and a concurrency slot are free."""
+        with self.condition:
+            while True:
+                self._refill()
+                if self.tokens >= 1 and self.in_flight < int(self.limit):
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                # Wake up when the next token is due or a slot is released
+                self.condition.wait(max((1 - self.tokens) / self.rate, 0.01))
+
+    def try_acquire(self) -> bool:
+        """Take a token and a slot if both are free right now."""
+        with self.condition:
+            self._refill()
+            if self.tokens >= 1 and self.in_flight < int(self.limit):
+                self.tokens -= 1
+                self.in_flight += 1
+                return True
+            return False
+
+    async def acquire_async(self) -> None:
+        """Wait for a token and a slot without blocking the event loop."""
+        while not self.try_acquire():
+            with self.condition:
+                delay = max((1 - self.tokens) / self.rate, 0.01)
+            await asyncio.sleep(delay)
+
+    def release(self, latency: float, ok: bool) -> None:
+        """Return a slot and adjust rate and limit from the outcome."""
+        with self.condition:
+            self.in_flight -= 1
+            if ok and latency <= self.latency_target:
+                self.successes += 1
+                self.rate = min(self.rate + SCRAPER_CONFIG['rate_increase'], self.max_rate)
+                self.limit = min(self.limit + 1 / max(self.limit, 1), self.max_concurrency)
+            else:
+                if not ok:
+                    self.failures += 1
+                self._decrease()
+            self.condition.notify_all()
+
+    def throttled(self) -> None:
+        """Report a throttling signal such as a captcha page."""
+        with self.condition:
+            self.throttles += 1
+            self._decrease()
+
+    def _decrease(self) -> None:
+        self.rate = max(self.rate * SCRAPER_CONFIG['rate_decrease'], self.min_rate)
+        self.limit = max(self.limit * SCRAPER_CONFIG['rate_decrease'], 1)
+
+    @contextmanager
+    def request(self):
+        """Wrap one page operation; exceptions count as failures and propagate."""
+        self.acquire()
+        start = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.release(time.monotonic() - start, ok)
+
+    @asynccontextmanager
+    async def request_async(self):
+        """request() for coroutines; other tasks keep running while it waits."""
+        await self.acquire_async()
+        start = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.release(time.monotonic() - start, ok)
+
+    def backoff(self, attempt: int) -> float:
+        """Retry delay in seconds for the given retry (1 for the first): exponential with full jitter."""
+        ceiling = min(SCRAPER_CONFIG['backoff_base'] * 2 ** (attempt - 1), SCRAPER_CONFIG['backoff_cap'])
+        return random.uniform(0, ceiling)
+
+    def state(self) -> dict:
+        with self.condition:
+            return {
+                'rate': round(self.rate, 3),
+                'concurrency_limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'successes': self.successes,
+                'failures': self.failures,
+                'throttles': self.throttles
+            }
+
+_shared: Optional[RateController] = None
+_shared_lock = threading.Lock()
+
+def shared_controller() -> RateController:
+    """The run-wide controller, created from SCRAPER_CONFIG on first use."""
+    global _shared
+
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateController(
+                SCRAPER_CONFIG['rate_initial'],
+                SCRAPER_CONFIG['rate_min'],
+                SCRAPER_CONFIG['rate_max'],
+                SCRAPER_CONFIG['concurrency_max'],
+                SCRAPER_CONFIG['latency_target']
+            )
+        return _shared
@@ -0,0 +1,92 @@
+from array import array
+from dataclasses import replace
+from typing import Dict, Iterator, List, Tuple
+
+from .const.settings import Business, Review
+
+class ReviewStore:
+    """Businesses and their reviews with the reviews kept column by column.
+
+    Review texts share one UTF-8 buffer indexed by an offsets array, ratings
+    sit in a double array so they read back exactly, and time phrases, dates
+    and label lists are dictionary encoded. A stored review costs its text
+    bytes plus about 40 bytes instead of a Review object with its strings
+    and tuples. Businesses
+    are kept without reviews; the reviews of business i are the rows between
+    starts[i] and starts[i + 1].
+    """
+
+    def __init__(self):
+        self.shells: List[Business] = []
+        self.starts = array('q', [0])
+        self.ratings = array('d')
+        self.text_data = bytearray()
+        self.text_offsets = array('q', [0])
+        self.time_codes = array('I')
+        self.positive_codes = array('I')
+        self.negative_codes = array('I')
+        self.services_codes = array('I')
+        self.date_codes = array('I')
+        # Dictionary shared by time phrases, dates and label tuples
+        self.values: list = []
+        self.codes: Dict[object, int] = {}
+
+    def _encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def add(self, business: Business) -> None:
+        """Store a business; its Review objects can be dropped afterwards."""
+        self.shells.append(replace(business, reviews=[]))
+        for review in business.reviews:
+            self.ratings.append(review.rating)
+            self.text_data += review.text.encode('utf-8')
+            self.text_offsets.append(len(self.text_data))
+            self.time_codes.append(self._encode(review.time_posted))
+            self.positive_codes.append(self._encode(review.positive_points))
+            self.negative_codes.append(self._encode(review.negative_points))
+            self.services_codes.append(self._encode(review.services_used))
+            self.date_codes.append(self._encode(review.date_posted))
+        self.starts.append(len(self.ratings))
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+    def text(self, index: int) -> str:
+        return self.text_data[self.text_offsets[index]:self.text_offsets[index + 1]].decode('utf-8')
+
+    def review(self, index: int) -> Review:
+        return Review(
+            text=self.text(index),
+            rating=self.ratings[index],
+            time_posted=self.values[self.time_codes[index]],
+            positive_points=self.values[self.positive_codes[index]],
+            negative_points=self.values[self.negative_codes[index]],
+            services_used=self.values[self.services_codes[index]],
+            date_posted=self.values[self.date_codes[index]]
+        )
+
+    def businesses(self) -> Iterator[Business]:
+        """Yield businesses with their reviews, built one business at a time."""
+        for index, business in enumerate(self.shells):
+            reviews = [self.review(i) for i in range(self.starts[index], self.starts[index + 1])]
+            yield replace(business, reviews=reviews)
+
+    def review_rows(self) -> Iterator[Tuple]:
+        """Yield (business index, text, rating, time posted, positive, negative, services, date) per review."""
+        values = self.values
+        for business_index in range(len(self.shells)):
+            for i in range(self.starts[business_index], self.starts[business_index + 1]):
+                yield (
+                    business_index,
+                    self.text(i),
+                    self.ratings[i],
+                    values[self.time_codes[i]],
+                    values[self.positive_codes[i]],
+                    values[self.negative_codes[i]],
+                    values[self.services_codes[i]],
+                    values[self.date_codes[i]]
+                )
@@ -1,24 +1,78 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from typing import List, Optional
+from typing import Callable, List, Optional
+import asyncio
+import itertools
+import os
 import sys
+import threading
 import time
 
 from .scraper import GoogleMapsScraper
-from .workbook import create_workbook
+from .async_scraper import AsyncGoogleMapsScraper
+from .batch import read_queries, build_queries, run_batch, print_worker_stats
+from .tiling import run_tiled
+from .cache import BusinessCache
+from .checkpoint import Checkpoint
+from .profiler import NULL_PROFILER, Profiler
+from .network import enable_performance_log, block_lean_urls
+from .dedup import DedupIndex
+from .exporters import create_exporter, default_extension
+from .pipeline import ExportPipeline
+from .pool import DriverPool
+from .jobqueue import open_queue
+from .worker import run_worker, collect_results
+from .service import ScrapeService, serve
+from .ratelimit import shared_controller
 from .cliargs import parse_arguments
 from .helpers import setup_logger, print_colored
 from .const.colors import Colors
+from .const.settings import SCRAPER_CONFIG
 
-def setup_driver(headless: bool = False) -> webdriver.Chrome:
-    """Setup and configure Chrome WebDriver."""
+def setup_driver(headless: bool = False, lean: bool = False,
+                 profile_dir: Optional[str] = None) -> webdriver.Chrome:
+    """Setup and configure Chrome WebDriver.
+    
+    Lean mode skips downloading images, fonts, media, map tiles and
+    analytics. A profile_dir keeps caches and consent cookies between runs.
+    """
     options = Options()
     if headless:
         options.add_argument('--headless')
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
     
-    return webdriver.Chrome(options=options)
+    if profile_dir:
+        options.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
+    
+    if SCRAPER_CONFIG['network_extraction']:
+        enable_performance_log(options)
+    
+    if lean:
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2
+        })
+    
+    driver = webdriver.Chrome(options=options)
+    
+    if lean:
+        block_lean_urls(driver)
+    
+    return driver
+
+def driver_factory(args, profiler=NULL_PROFILER) -> Callable[[int], webdriver.Chrome]:
+    """Build a driver factory; the driver of each pool slot gets that slot's profile directory."""
+    def create(slot: int) -> webdriver.Chrome:
+        profile_dir = None
+        if args.profile_dir:
+            # Chrome locks a profile, so concurrent drivers cannot share one
+            profile_dir = os.path.join(args.profile_dir, f'worker-{slot}')
+        return profiler.wrap(setup_driver(args.headless, args.lean, profile_dir))
+    
+    return create
 
 def main():
     """Main entry point for the scraper."""
@@ -28,36 +82,169 @@ def main():
     # Setup logging
     logger = setup_logger(args.verbose)
     
+    if args.network:
+        SCRAPER_CONFIG['network_extraction'] = True
+    SCRAPER_CONFIG['lean'] = args.lean
+    SCRAPER_CONFIG['review_tabs'] = args.review_tabs
+    if args.rate:
+        SCRAPER_CONFIG['rate_initial'] = args.rate
+    if args.max_rate:
+        SCRAPER_CONFIG['rate_max'] = args.max_rate
+    
+    cache = None
+    checkpoint = None
+    pool = None
+    job_queue = None
+    dedup = DedupIndex(args.dedup_db) if args.dedup or args.dedup_db else None
+    profiler = Profiler() if args.profile else None
+    create_driver = driver_factory(args, profiler or NULL_PROFILER)
     try:
-        # Initialize driver
-        print_colored('Initializing Chrome WebDriver...', Colors.BLUE)
-        driver = setup_driver(args.headless)
+        if args.checkpoint:
+            checkpoint = Checkpoint(args.checkpoint, args.resume)
         
-        # Create scraper instance
-        scraper = GoogleMapsScraper(driver)
+        if args.cache:
+            cache = BusinessCache(
+                args.cache,
+                args.cache_ttl,
+                SCRAPER_CONFIG['cache_max_entries'],
+                SCRAPER_CONFIG['cache_retention']
+            )
         
-        # Build search query
-        query = f'{args.location} {args.business_type}'
-        print_colored(f'Searching for: {query}', Colors.BLUE)
+        if args.serve:
+            # Daemon mode: drivers stay warm between jobs received over HTTP
+            print_colored(f'Starting {args.workers} Chrome WebDriver(s)...', Colors.BLUE)
+            pool = DriverPool(create_driver, args.workers)
+            serve(ScrapeService(pool, cache, args.incremental, profiler), args.host, args.port)
+            return
         
-        # Perform scraping
-        businesses = scraper.scrape_businesses(query, args.max_results)
+        if args.queue:
+            # Distributed mode: queue the given jobs for workers on any host
+            job_queue = open_queue(args.queue)
+            jobs = []
+            if args.queries_file:
+                jobs.extend((query, '', args.max_results) for query in read_queries(args.queries_file))
+            if args.locations:
+                jobs.extend((location, business_type, args.max_results)
+                            for location, business_type in itertools.product(args.locations, args.business_types))
+            elif args.location and args.business_type:
+                jobs.append((args.location, args.business_type, args.max_results))
+            if jobs:
+                added = job_queue.put(jobs)
+                print_colored(f'Queued {added} jobs ({len(jobs) - added} already in the queue)', Colors.BLUE)
         
-        if not businesses:
-            print_colored('No businesses found!', Colors.RED)
-            sys.exit(1)
-            
-        print_colored(f'Found {len(businesses)} businesses', Colors.GREEN)
+        # Drivers are launched and warmed up in parallel before scraping starts;
+        # a queue coordinator that does not work itself needs none
+        if not args.queue or args.worker:
+            batch = args.bbox or args.queue or ((args.queries_file or args.locations) and args.engine == 'sync')
+            size = args.workers if batch else 1
+            print_colored(f'Starting {size} Chrome WebDriver(s)...', Colors.BLUE)
+            pool = DriverPool(create_driver, size)
+        
+        if args.queue and not jobs:
+            # Worker mode: results go back to the queue instead of an output file
+            print_colored(f'Working on {args.queue} with {args.workers} workers...', Colors.BLUE)
+            stats = run_worker(job_queue, pool, args.workers, cache, args.incremental, profiler, dedup)
+            print_worker_stats(stats)
+            return
         
-        # Create Excel workbook
         if args.output:
             output_file = args.output
         else:
             timestamp = time.strftime('%Y%m%d_%H%M%S')
-            output_file = f'businesses_{timestamp}.xlsx'
+            output_file = f'businesses_{timestamp}.{default_extension(args.format)}'
+        
+        # Businesses are written on a separate thread while scraping goes on
+        print_colored(f'Writing {args.format} output: {output_file}', Colors.BLUE)
+        with ExportPipeline(create_exporter(args.format, output_file), profiler, args.normalize, args.columnar) as pipeline:
+            if job_queue:
+                # Coordinator: export what the workers push back, also working with --worker
+                if args.worker:
+                    working = threading.Thread(
+                        target=run_worker,
+                        args=(job_queue, pool, args.workers, cache, args.incremental, profiler, dedup),
+                        daemon=True
+                    )
+                    working.start()
+                collect_results(job_queue, pipeline.put)
+                if args.worker:
+                    working.join()
+            elif args.bbox:
+                # Tiling mode: the viewport replaces the location in the query
+                print_colored(f'Tiling {args.business_type} in {args.location} ({args.tile_grid}x{args.tile_grid} grid)...', Colors.BLUE)
+                _, stats = run_tiled(
+                    args.business_type,
+                    tuple(args.bbox),
+                    args.tile_grid,
+                    args.max_results,
+                    args.workers,
+                    pool,
+                    cache,
+                    args.incremental,
+                    checkpoint,
+                    profiler,
+                    dedup,
+                    pipeline.put
+                )
+                print_worker_stats(stats)
+            elif args.queries_file or args.locations:
+                # Batch mode: spread queries over a pool of drivers
+                queries = []
+                if args.queries_file:
+                    queries.extend(read_queries(args.queries_file))
+                if args.locations:
+                    queries.extend(build_queries(args.locations, args.business_types))
+                    
+                if args.engine == 'async':
+                    print_colored(f'Running {len(queries)} queries on {args.tabs} tabs...', Colors.BLUE)
+                    scraper = AsyncGoogleMapsScraper(pool.acquire(), args.tabs)
+                    for business in asyncio.run(scraper.scrape_queries(queries, args.max_results)):
+                        pipeline.put(business)
+                    if scraper.failed:
+                        print_colored(f'{len(scraper.failed)} of {len(queries)} queries failed', Colors.YELLOW)
+                else:
+                    print_colored(f'Running {len(queries)} queries on {args.workers} workers...', Colors.BLUE)
+                    _, stats = run_batch(
+                        queries,
+                        args.max_results,
+                        args.workers,
+                        pool,
+                        cache,
+                        args.incremental,
+                        checkpoint,
+                        profiler,
+                        dedup,
+                        pipeline.put
+                    )
+                    print_worker_stats(stats)
+            else:
+                driver = pool.acquire()
+                
+                # Build search query
+                query = f'{args.location} {args.business_type}'
+                print_colored(f'Searching for: {query}', Colors.BLUE)
+                
+                # Perform scraping
+                if args.engine == 'async':
+                    businesses = AsyncGoogleMapsScraper(driver, 1).scrape_businesses(query, args.max_results)
+                else:
+                    scraper = GoogleMapsScraper(driver, cache, args.incremental, checkpoint, profiler, dedup,
+                                                recover=pool.recover)
+                    businesses = scraper.iter_businesses(query, args.max_results)
+                for business in businesses:
+                    pipeline.put(business)
+        
+        if cache:
+            print_colored(f'Cache: {cache.hits} hits, {cache.misses} misses', Colors.CYAN)
+        if dedup:
+            print_colored(f'Dedup: {dedup.skipped} duplicates skipped', Colors.CYAN)
+        if pool and (pool.replaced or pool.recycled):
+            print_colored(f'Drivers: {pool.replaced} crashed and replaced, {pool.recycled} recycled', Colors.CYAN)
+        
+        if not pipeline.count:
+            print_colored('No businesses found!', Colors.RED)
+            sys.exit(1)
             
-        print_colored(f'Creating Excel workbook: {output_file}', Colors.BLUE)
-        create_workbook(businesses, output_file)
+        print_colored(f'Found {pipeline.count} businesses', Colors.GREEN)
         
         print_colored('Scraping completed successfully!', Colors.GREEN)
         
@@ -66,8 +253,26 @@ def main():
         sys.exit(1)
         
     finally:
-        if 'driver' in locals():
-            driver.quit()
+        rate = shared_controller().state()
+        print_colored(f'Rate: {rate["rate"]}/s, concurrency {rate["concurrency_limit"]}, '
+                      f'{rate["failures"]} failures, {rate["throttles"]} throttled', Colors.CYAN)
+        if profiler:
+            profiler.record_rate(rate)
+            print_colored(profiler.summary(), Colors.CYAN)
+            if args.metrics_json:
+                profiler.write_json(args.metrics_json)
+            if args.metrics_prom:
+                profiler.write_prometheus(args.metrics_prom)
+        if pool:
+            pool.close()
+        if job_queue:
+            job_queue.close()
+        if cache:
+            cache.close()
+        if checkpoint:
+            checkpoint.close()
+        if dedup:
+            dedup.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -3,86 +3,134 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import List, Optional
+from dataclasses import replace
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import quote_plus
 import time
 
 from .const.settings import SELECTORS, SCRAPER_CONFIG, Business, Review
+from .const.scripts import EXTRACT_BUSINESS_CARDS, SCROLL_AND_WAIT, PAGE_TRAFFIC, CARD_LINKS, SORT_REVIEWS_NEWEST
+from .cache import BusinessCache, business_key, review_key
+from .checkpoint import Checkpoint
+from .profiler import NULL_PROFILER, Profiler
+from .network import ResponseCapture
+from .dedup import DedupIndex, business_identity
+from .ratelimit import RateController, shared_controller
+from .normalize import build_businesses, split_address
+from .helpers import parse_rating, parse_review_count, review_date
+from .harvester import ReviewHarvester
 
 class GoogleMapsScraper:
-    def __init__(self, driver: webdriver.Chrome):
+    def __init__(self, driver: webdriver.Chrome, cache: Optional[BusinessCache] = None,
+                 incremental: bool = False, checkpoint: Optional[Checkpoint] = None,
+                 profiler: Optional[Profiler] = None, dedup: Optional[DedupIndex] = None,
+                 rate: Optional[RateController] = None,
+                 recover: Optional[Callable[[webdriver.Chrome], webdriver.Chrome]] = None):
+        self.cache = cache
+        self.incremental = incremental
+        self.checkpoint = checkpoint
+        self.profiler = profiler or NULL_PROFILER
+        self.dedup = dedup
+        self.rate = rate or shared_controller()
+        # Called before a retry; returns the driver or a replacement for a crashed one
+        self.recover = recover
+        self.last_duplicates = 0
+        self._use_driver(driver)
+    
+    def _use_driver(self, driver: webdriver.Chrome) -> None:
         self.driver = driver
+        self.capture = ResponseCapture(driver) if SCRAPER_CONFIG['network_extraction'] else None
         self.wait = WebDriverWait(driver, SCRAPER_CONFIG['page_load_timeout'])
+        self.driver.set_script_timeout(SCRAPER_CONFIG['scroll_timeout'] + SCRAPER_CONFIG['page_load_timeout'])
+    
+    def search(self, query: str, viewport: Optional[str] = None) -> None:
+        """Search for businesses on Google Maps.
+        
+        A viewport such as '@49.3,10.57,14z' restricts the search to that
+        map area by opening the search URL directly. The page load is paced
+        by the rate controller.
+        """
+        with self.rate.request():
+            self._search(query, viewport)
     
-    def search(self, query: str) -> None:
-        """Search for businesses on Google Maps."""
+    def _search(self, query: str, viewport: Optional[str] = None) -> None:
         try:
             # Navigate to Google Maps
-            self.driver.get('https://www.google.com/maps')
+            if self.capture:
+                self.capture.clear()
+            if viewport:
+                self.driver.get(f'{SCRAPER_CONFIG["maps_url"]}/search/{quote_plus(query)}/{viewport}')
+            else:
+                self.driver.get(SCRAPER_CONFIG['maps_url'])
+            self.driver.execute_script('performance.setResourceTimingBufferSize(100000);')
             
             # Handle cookie consent if present
-            try:
-                consent_button = self.driver.find_element(By.XPATH, '//button[contains(., "Accept all")]')
-                consent_button.click()
-            except NoSuchElementException:
-                pass
-            
-            # Find and fill search box
-            search_box = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS['search_box'])))
-            search_box.clear()
-            search_box.send_keys(query)
+            self.accept_consent()
             
-            # Click search button
-            search_button = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SELECTORS['search_button'])))
-            search_button.click()
+            if not viewport:
+                # Find and fill search box
+                search_box = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS['search_box'])))
+                search_box.clear()
+                search_box.send_keys(query)
+                
+                # Click search button
+                search_button = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SELECTORS['search_button'])))
+                search_button.click()
             
             # Wait for results to load
             self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS['business_list'])))
             
         except TimeoutException as e:
+            # Maps redirects to a captcha page when it throttles a client
+            if '/sorry/' in self.driver.current_url:
+                self.rate.throttled()
+                raise Exception('Search blocked by a captcha page')
             raise Exception(f'Search operation timed out: {str(e)}')
         except Exception as e:
             raise Exception(f'Error during search: {str(e)}')
     
-    def scroll_results(self, max_results: int) -> None:
-        """Scroll through results until max_results is reached or end of list."""
-        scrolled_items = 0
-        last_height = 0
+    def page_traffic(self) -> dict:
+        """Page load time and bytes transferred since the last navigation."""
+        return self.driver.execute_script(PAGE_TRAFFIC)
+    
+    def accept_consent(self) -> None:
+        """Accept the cookie consent dialog if it is shown."""
+        try:
+            consent_button = self.driver.find_element(By.XPATH, '//button[contains(., "Accept all")]')
+            consent_button.click()
+        except NoSuchElementException:
+            pass
+    
+    def scroll_results(self, max_results: int) -> dict:
+        """Scroll through results until max_results is reached or end of list.
         
-        while scrolled_items < max_results:
-            # Scroll to bottom of results
-            self.driver.execute_script(
-                'document.querySelector(arguments[0]).scrollTop += 1000;', 
-                SELECTORS['business_list']
-            )
-            
-            # Wait for scroll
-            time.sleep(SCRAPER_CONFIG['scroll_delay'])
-            
-            # Check if we've reached the end
-            new_height = self.driver.execute_script(
-                'return document.querySelector(arguments[0]).scrollHeight;',
-                SELECTORS['business_list']
-            )
+        Each step waits in the page for new cards instead of sleeping, and
+        returns the number of scroll steps and total wait time.
+        """
+        timeout_ms = int(SCRAPER_CONFIG['scroll_timeout'] * 1000)
+        stats = {'steps': 0, 'wait_time': 0.0}
+        last_count = -1
+        
+        while True:
+            result = self.driver.execute_async_script(SCROLL_AND_WAIT, SELECTORS, timeout_ms)
+            stats['steps'] += 1
+            stats['wait_time'] += result['waited']
             
-            if new_height == last_height:
+            # Stop at the target, the end of the list, or when nothing new loaded
+            if result['count'] >= max_results or result['ended'] or result['count'] == last_count:
                 break
                 
-            last_height = new_height
-            scrolled_items = len(self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['business_cards']))
+            last_count = result['count']
+            
+        return stats
     
     def extract_business_data(self, card_element) -> Business:
         """Extract business data from a card element."""
         try:
             # Extract basic info
             name = card_element.find_element(By.CSS_SELECTOR, SELECTORS['name']).text
-            address_elem = card_element.find_element(By.CSS_SELECTOR, SELECTORS['address'])
-            full_address = address_elem.text.split(',')
-            
-            # Parse address
-            street_address = full_address[0].strip()
-            postal_and_city = full_address[-1].strip().split(' ')
-            postal_code = postal_and_city[0]
-            city = ' '.join(postal_and_city[1:])
+            address = card_element.find_element(By.CSS_SELECTOR, SELECTORS['address']).text
             
             # Get optional fields
             try:
@@ -96,100 +144,474 @@ class GoogleMapsScraper:
                 website = None
                 
             # Get rating info
-            rating = float(card_element.find_element(By.CSS_SELECTOR, SELECTORS['rating']).text)
-            review_count_text = card_element.find_element(By.CSS_SELECTOR, SELECTORS['review_count']).text
-            num_ratings = int(''.join(filter(str.isdigit, review_count_text)))
-            
-            return Business(
-                name=name,
-                street_address=street_address,
-                postal_code=postal_code,
-                city=city,
-                phone=phone,
-                website=website,
-                avg_rating=rating,
-                num_ratings=num_ratings,
-                reviews=[]
-            )
+            rating = card_element.find_element(By.CSS_SELECTOR, SELECTORS['rating']).text
+            review_count = card_element.find_element(By.CSS_SELECTOR, SELECTORS['review_count']).text
+            
+            return self._build_business(name, address, phone, website, rating, review_count)
             
         except Exception as e:
             raise Exception(f'Error extracting business data: {str(e)}')
     
-    def get_reviews(self, business_card) -> List[Review]:
-        """Get reviews for a business."""
+    def extract_all_business_data(self) -> List[Optional[Business]]:
+        """Extract business data for every loaded card in a single script call.
+        
+        Returns one entry per card in DOM order; entries are None where the
+        card is missing a required field and needs the per-element path.
+        """
+        records = self.driver.execute_script(EXTRACT_BUSINESS_CARDS, SELECTORS)
+        return build_businesses(records)
+    
+    def _build_business(self, name: str, address: str, phone: Optional[str],
+                        website: Optional[str], rating: str, review_count: str) -> Business:
+        """Build a Business from the raw text of a card's fields."""
+        if not name or not address or rating is None or review_count is None:
+            raise ValueError('Missing required business field')
+        
+        street_address, postal_code, city = split_address(address)
+        
+        return Business(
+            name=name,
+            street_address=street_address,
+            postal_code=postal_code,
+            city=city,
+            phone=phone,
+            website=website,
+            avg_rating=parse_rating(rating),
+            num_ratings=parse_review_count(review_count),
+            reviews=[]
+        )
+    
+    def get_reviews(self, business_card, stored: Optional[List[Review]] = None) -> List[Review]:
+        """Get reviews for a business.
+        
+        With the stored reviews (newest first) given, the pane is sorted
+        newest first, then reading stops where the stored reviews begin and
+        only scrolls while no stored review has been reached. If the pane
+        cannot be sorted, every loaded review is returned instead.
+        """
         reviews = []
         try:
-            # Click reviews tab
+            # Click reviews tab and wait for the first reviews to load
             reviews_tab = business_card.find_element(By.CSS_SELECTOR, SELECTORS['reviews_tab'])
-            reviews_tab.click()
+            if self.capture:
+                # Responses still loading for the previous card must not count for this one
+                self.capture.begin('reviews')
+            with self.rate.request():
+                reviews_tab.click()
+                try:
+                    WebDriverWait(self.driver, SCRAPER_CONFIG['review_scroll_timeout']).until(
+                        lambda d: business_card.find_elements(By.CSS_SELECTOR, SELECTORS['review_items'])
+                    )
+                except TimeoutException:
+                    pass  # No reviews
+            
+            # Maps sorts by relevance, where the stored newest review is no boundary
+            if stored is not None and not self.sort_reviews_newest(business_card):
+                stored = None
             
-            # Wait for reviews to load
-            time.sleep(1)
+            # Use the reviews XHR response when it was captured and parses
+            if self.capture:
+                captured = self.capture.reviews()
+                if captured and stored is None:
+                    return captured
+                start = self._stored_start(captured, stored) if captured else None
+                if start is not None:
+                    return captured[:start]
             
             # Extract reviews
             review_elements = business_card.find_elements(By.CSS_SELECTOR, SELECTORS['review_items'])
+            if stored is None:
+                return [self._extract_review(review_elem) for review_elem in review_elements]
             
-            for review_elem in review_elements:
-                text = review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_text']).text
-                rating = float(review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_rating']).get_attribute('aria-label').split()[0])
-                time_posted = review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_time']).text
+            processed = 0
+            while True:
+                for review_elem in review_elements[processed:]:
+                    reviews.append(self._extract_review(review_elem))
+                processed = len(review_elements)
+                start = self._stored_start(reviews, stored)
+                if start is not None:
+                    return reviews[:start]
                 
-                # Get optional points
+                # Scroll lazily, only while every loaded review is new
+                self.driver.execute_script('arguments[0].scrollIntoView();', review_elements[-1])
                 try:
-                    points_elem = review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_points'])
-                    points_text = points_elem.text.split('\n')
-                    positive_points = [p for p in points_text if 'Positive' in p]
-                    negative_points = [p for p in points_text if 'Negative' in p]
-                    services = review_elem.find_elements(By.CSS_SELECTOR, SELECTORS['review_services'])
-                    services_used = [s.text for s in services]
-                except NoSuchElementException:
-                    positive_points = None
-                    negative_points = None
-                    services_used = None
-                
-                reviews.append(Review(
-                    text=text,
-                    rating=rating,
-                    time_posted=time_posted,
-                    positive_points=positive_points,
-                    negative_points=negative_points,
-                    services_used=services_used
-                ))
+                    WebDriverWait(self.driver, SCRAPER_CONFIG['review_scroll_timeout']).until(
+                        lambda d: len(business_card.find_elements(By.CSS_SELECTOR, SELECTORS['review_items'])) > processed
+                    )
+                except TimeoutException:
+                    break
+                review_elements = business_card.find_elements(By.CSS_SELECTOR, SELECTORS['review_items'])
                 
         except Exception as e:
             print(f'Error getting reviews: {str(e)}')
             
         return reviews
     
-    def scrape_businesses(self, query: str, max_results: int = 20) -> List[Business]:
+    def _stored_start(self, reviews: List[Review], stored: List[Review]) -> Optional[int]:
+        """Index in reviews where the stored reviews begin, or None if not reached yet.
+        
+        The newest stored review is found by its review id. Without ids,
+        rating and text may be shared by other reviews, so a run of the
+        newest stored reviews has to appear in order.
+        """
+        newest = stored[0].review_id
+        if newest and any(review.review_id for review in reviews):
+            ids = [review.review_id for review in reviews]
+            return ids.index(newest) if newest in ids else None
+        
+        run = [review_key(review) for review in stored[:SCRAPER_CONFIG['review_anchor_run']]]
+        keys = [review_key(review) for review in reviews]
+        for start in range(len(keys) - len(run) + 1):
+            if keys[start:start + len(run)] == run:
+                return start
+        return None
+    
+    def sort_reviews_newest(self, scope=None) -> bool:
+        """Sort the open reviews pane newest first; returns False if that failed."""
+        if self.capture:
+            # The reload after sorting sends a fresh reviews response
+            self.capture.begin('reviews')
+        timeout_ms = int(SCRAPER_CONFIG['review_scroll_timeout'] * 1000)
+        try:
+            return bool(self.driver.execute_async_script(SORT_REVIEWS_NEWEST, SELECTORS, timeout_ms, scope))
+        except Exception:
+            return False
+    
+    def _extract_review(self, review_elem) -> Review:
+        """Extract a single review from a review element."""
+        text = review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_text']).text
+        rating_label = review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_rating']).get_attribute('aria-label')
+        time_posted = review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_time']).text
+        
+        # Get optional points
+        try:
+            points = review_elem.find_element(By.CSS_SELECTOR, SELECTORS['review_points']).text
+            services = [s.text for s in review_elem.find_elements(By.CSS_SELECTOR, SELECTORS['review_services'])]
+        except NoSuchElementException:
+            points = None
+            services = None
+        
+        review_id = review_elem.get_attribute('data-review-id')
+        return self._build_review(text, rating_label, time_posted, points, services, review_id)
+    
+    def _build_review(self, text: str, rating_label: str, time_posted: str,
+                      points: Optional[str], services: Optional[List[str]],
+                      review_id: Optional[str] = None) -> Review:
+        """Build a Review from the raw text of a review's fields."""
+        if text is None or rating_label is None or time_posted is None:
+            raise ValueError('Missing required review field')
+        
+        positive_points = None
+        negative_points = None
+        services_used = None
+        if points is not None:
+            points_text = points.split('\n')
+            positive_points = [p for p in points_text if 'Positive' in p]
+            negative_points = [p for p in points_text if 'Negative' in p]
+            services_used = services
+        
+        return Review(
+            text=text,
+            rating=float(rating_label.split()[0]),
+            time_posted=time_posted,
+            positive_points=positive_points,
+            negative_points=negative_points,
+            services_used=services_used,
+            date_posted=review_date(time_posted),
+            review_id=review_id or None
+        )
+    
+    def _extract_cards_bulk(self, card_count: int) -> List[Optional[Business]]:
+        """Run bulk extraction if enabled, padding with None on mismatch or failure.
+        
+        Captured search responses are preferred when they cover every card.
+        """
+        if self.capture:
+            captured = self.capture.businesses()
+            if len(captured) == card_count:
+                return captured
+        
+        if SCRAPER_CONFIG['bulk_extraction']:
+            try:
+                extracted = self.extract_all_business_data()
+                if len(extracted) == card_count:
+                    return extracted
+            except Exception as e:
+                print(f'Bulk extraction failed, using per-element path: {str(e)}')
+                
+        return [None] * card_count
+    
+    def _get_new_reviews(self, card, business: Business) -> List[Review]:
+        """Fetch reviews newer than the stored ones and merge them in."""
+        previous = self.cache.get_latest(business_key(business)) if self.cache else None
+        if previous is None or not previous.reviews:
+            return self.get_reviews(card)
+        
+        new_reviews = self.get_reviews(card, previous.reviews)
+        return self._merge_reviews(new_reviews, previous.reviews)
+    
+    def _merge_reviews(self, new_reviews: List[Review], stored: List[Review]) -> List[Review]:
+        """New reviews followed by the stored ones that are not among them.
+        
+        Reviews with ids match by id. The others match one for one by
+        rating and text, so stored reviews that only look alike are kept.
+        """
+        new_ids = {review.review_id for review in new_reviews if review.review_id}
+        stored_ids = {review.review_id for review in stored if review.review_id}
+        # A new review without an id may be any stored review; one whose id the
+        # store lacks may still be a stored review kept before ids were
+        unmatched = Counter(review_key(review) for review in new_reviews if not review.review_id)
+        unknown = Counter(review_key(review) for review in new_reviews
+                          if review.review_id and review.review_id not in stored_ids)
+        
+        merged = list(new_reviews)
+        for review in stored:
+            if review.review_id in new_ids:
+                continue
+            key = review_key(review)
+            if unmatched[key]:
+                unmatched[key] -= 1
+            elif not review.review_id and unknown[key]:
+                unknown[key] -= 1
+            else:
+                merged.append(review)
+        return merged
+    
+    def _harvested_reviews(self, business: Business, reviews: List[Review]) -> List[Review]:
+        """Reviews loaded in a background tab, merged with the stored ones when incremental.
+        
+        A tab only holds its first page of reviews, so all of them are
+        merged rather than cut at the stored newest review.
+        """
+        previous = self.cache.get_latest(business_key(business)) if self.cache and self.incremental else None
+        if previous is None or not previous.reviews:
+            return reviews
+        return self._merge_reviews(reviews, previous.reviews)
+    
+    def _accept(self, job: str, business: Business, completed: Dict[str, Business],
+                claimed: Dict[str, str], duplicates: set) -> Optional[str]:
+        """Return the business key, or None when the card is to be skipped."""
+        key = business_key(business)
+        
+        # Skip cards finished before a retry or resume
+        if key in completed:
+            return None
+        
+        # Skip places another query, tile or worker already took
+        if self.dedup:
+            identity = business_identity(business)
+            if identity in duplicates:
+                return None
+            if identity not in claimed:
+                if not self.dedup.claim(identity, job):
+                    duplicates.add(identity)
+                    self.last_duplicates = len(duplicates)
+                    return None
+                claimed[identity] = key
+        
+        return key
+    
+    def _complete(self, job: str, completed: Dict[str, Business], key: str,
+                  business: Business, fetched: bool = True) -> Business:
+        """Record a finished business in the cache and checkpoint."""
+        if fetched and self.cache:
+            self.cache.put(business)
+        completed[key] = business
+        if self.checkpoint:
+            self.checkpoint.add_business(job, business)
+        return business
+    
+    def scrape_businesses(self, query: str, max_results: int = 20,
+                          viewport: Optional[str] = None) -> List[Business]:
         """Main method to scrape businesses."""
-        businesses = []
-        retry_count = 0
+        return list(self.iter_businesses(query, max_results, viewport))
+    
+    def iter_businesses(self, query: str, max_results: int = 20,
+                        viewport: Optional[str] = None) -> Iterator[Business]:
+        """Yield businesses one by one as soon as each is fully scraped.
+        
+        Finished businesses are kept across retries (and checkpointed when a
+        checkpoint is set), so a retry resumes at the card that failed and
+        nothing is yielded twice. With SCRAPER_CONFIG['review_tabs'] set,
+        reviews load in background tabs while the results keep scrolling.
+        """
+        # Tiles of the same query are checkpointed separately
+        job = f'{query} {viewport}' if viewport else query
         
+        completed: Dict[str, Business] = {}
+        if self.checkpoint:
+            completed = self.checkpoint.businesses_for(job)
+            yield from completed.values()
+            if self.checkpoint.is_query_done(job):
+                return
+        
+        # Identities this call claimed (with their business keys) or lost in
+        # the dedup index, so retries neither skip their own cards nor count
+        # a duplicate twice
+        claimed: Dict[str, str] = {}
+        duplicates = set()
+        self.last_duplicates = 0
+        try:
+            yield from self._retry_businesses(query, job, max_results, viewport, completed, claimed, duplicates)
+        except BaseException:
+            # Places claimed but never finished are free for other queries again
+            if self.dedup:
+                self.dedup.release(identity for identity, key in claimed.items() if key not in completed)
+            raise
+    
+    def _retry_businesses(self, query: str, job: str, max_results: int, viewport: Optional[str],
+                          completed: Dict[str, Business], claimed: Dict[str, str],
+                          duplicates: set) -> Iterator[Business]:
+        """Search and extract, retrying with backoff and a recovered driver."""
+        retry_count = 0
         while retry_count < SCRAPER_CONFIG['max_retries']:
             try:
                 # Perform search
-                self.search(query)
+                with self.profiler.stage('search'):
+                    self.search(query, viewport)
                 
-                # Scroll to load desired number of results
-                self.scroll_results(max_results)
+                if SCRAPER_CONFIG['review_tabs']:
+                    yield from self._iter_harvested(job, max_results, completed, claimed, duplicates)
+                else:
+                    yield from self._iter_inline(job, max_results, completed, claimed, duplicates)
                 
-                # Get all business cards
-                cards = self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['business_cards'])
+                if self.checkpoint:
+                    self.checkpoint.complete_query(job)
                 
-                # Process each business
-                for card in cards[:max_results]:
-                    business = self.extract_business_data(card)
-                    business.reviews = self.get_reviews(card)
-                    businesses.append(business)
-                    
+                traffic = self.page_traffic()
+                print(f'Page load {traffic["load_time"] or 0:.2f}s, '
+                      f'{traffic["bytes"] / 1024:.0f} KB in {traffic["requests"]} requests')
                 break  # Success, exit retry loop
                 
             except Exception as e:
                 retry_count += 1
                 if retry_count >= SCRAPER_CONFIG['max_retries']:
                     raise Exception(f'Failed to scrape after {retry_count} retries: {str(e)}')
-                print(f'Retry {retry_count}: {str(e)}')
-                time.sleep(1)
+                delay = self.rate.backoff(retry_count)
+                print(f'Retry {retry_count} in {delay:.1f}s: {str(e)}')
+                time.sleep(delay)
+                if self.recover:
+                    try:
+                        driver = self.recover(self.driver)
+                    except Exception as recover_error:
+                        # Keep the old driver; the next attempt fails fast or recovers again
+                        print(f'Could not replace driver: {str(recover_error)}')
+                        continue
+                    if driver is not self.driver:
+                        self._use_driver(driver)
+    
+    def _iter_inline(self, job: str, max_results: int, completed: Dict[str, Business],
+                     claimed: Dict[str, str], duplicates: set) -> Iterator[Business]:
+        """Scroll all results, then open each card's reviews pane in turn."""
+        # Scroll to load desired number of results
+        with self.profiler.stage('scroll_results'):
+            scroll_stats = self.scroll_results(max_results)
+        print(f'Scrolled {scroll_stats["steps"]} steps, waited {scroll_stats["wait_time"]:.2f}s')
+        
+        with self.profiler.stage('extract_business_data'):
+            # Get all business cards
+            cards = self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['business_cards'])
+            
+            # Extract all cards in one round-trip, falling back per card
+            extracted = self._extract_cards_bulk(len(cards))
+        
+        # Process each business
+        for index, card in enumerate(cards[:max_results]):
+            business = extracted[index]
+            if business is None:
+                with self.profiler.stage('extract_business_data'):
+                    business = self.extract_business_data(card)
+            key = self._accept(job, business, completed, claimed, duplicates)
+            if key is None:
+                continue
+            
+            # Skip the reviews pane when a fresh copy is cached
+            cached = self.cache.get(key) if self.cache else None
+            if cached:
+                yield self._complete(job, completed, key, cached, fetched=False)
+                continue
+            
+            with self.profiler.stage('get_reviews'), self.profiler.business(business.name):
+                if self.incremental:
+                    business = replace(business, reviews=self._get_new_reviews(card, business))
+                else:
+                    business = replace(business, reviews=self.get_reviews(card))
+            yield self._complete(job, completed, key, business)
+    
+    def _iter_harvested(self, job: str, max_results: int, completed: Dict[str, Business],
+                        claimed: Dict[str, str], duplicates: set) -> Iterator[Business]:
+        """Scroll the results step by step while reviews load in background tabs.
+        
+        Cards are queued for the harvester as soon as they appear. Cards
+        without a detail link get their reviews inline once the tabs are done.
+        """
+        harvester = ReviewHarvester(self, SCRAPER_CONFIG['review_tabs'])
+        timeout_ms = int(SCRAPER_CONFIG['scroll_timeout'] * 1000)
+        inline = []
+        processed = 0
+        last_count = -1
+        ended = False
+        
+        def harvested(finished) -> Iterator[Business]:
+            for (key, business), reviews in finished:
+                business = replace(business, reviews=self._harvested_reviews(business, reviews))
+                yield self._complete(job, completed, key, business)
+        
+        try:
+            while True:
+                with self.profiler.stage('extract_business_data'):
+                    cards = self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['business_cards'])
+                    extracted = self._extract_cards_bulk(len(cards))
+                    links = self.driver.execute_script(CARD_LINKS, SELECTORS)
+                
+                for index in range(processed, min(len(cards), max_results)):
+                    business = extracted[index]
+                    if business is None:
+                        with self.profiler.stage('extract_business_data'):
+                            business = self.extract_business_data(cards[index])
+                    key = self._accept(job, business, completed, claimed, duplicates)
+                    if key is None:
+                        continue
+                    
+                    cached = self.cache.get(key) if self.cache else None
+                    if cached:
+                        yield self._complete(job, completed, key, cached, fetched=False)
+                    elif index < len(links) and links[index]:
+                        harvester.submit((key, business), links[index])
+                    else:
+                        inline.append((key, business, cards[index]))
+                processed = min(len(cards), max_results)
                 
-        return businesses
\ No newline at end of file
+                with self.profiler.stage('get_reviews'):
+                    finished = harvester.poll()
+                yield from harvested(finished)
+                
+                if len(cards) >= max_results or ended or len(cards) == last_count:
+                    break
+                last_count = len(cards)
+                
+                # The open tabs keep loading while the results tab waits here
+                with self.profiler.stage('scroll_results'):
+                    ended = self.driver.execute_async_script(SCROLL_AND_WAIT, SELECTORS, timeout_ms)['ended']
+            
+            # Results are done; wait for the remaining tabs
+            while harvester.pending:
+                with self.profiler.stage('get_reviews'):
+                    finished = harvester.poll()
+                if not finished:
+                    time.sleep(SCRAPER_CONFIG['async_poll_interval'])
+                yield from harvested(finished)
+        finally:
+            harvester.close()
+        
+        if harvester.reviews:
+            print(f'Harvested {harvester.reviews} reviews of {harvester.businesses} businesses '
+                  f'on {harvester.tabs} tabs ({harvester.reviews_per_second:.1f} reviews/s)')
+        
+        for key, business, card in inline:
+            with self.profiler.stage('get_reviews'), self.profiler.business(business.name):
+                if self.incremental:
+                    business = replace(business, reviews=self._get_new_reviews(card, business))
+                else:
+                    business = replace(business, reviews=self.get_reviews(card))
+            yield self._complete(job, completed, key, business)
@@ -0,0 +1,157 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+import json
+import threading
+import time
+
+from .pool import DriverPool
+from .cache import BusinessCache, business_to_dict
+from .profiler import Profiler
+from .normalize import normalize_businesses
+from .ratelimit import shared_controller
+from .helpers import print_colored
+from .const.colors import Colors
+from .const.settings import Business
+
+class ScrapeService:
+    """Warm drivers shared by the jobs of a long-running scraper daemon.
+
+    Every job borrows a driver from the pool for as long as it runs, so up
+    to pool size jobs scrape concurrently and later ones wait for a free
+    driver. Drivers stay open between jobs, already on Maps with the
+    consent dialog accepted.
+    """
+
+    def __init__(self, pool: DriverPool,
+                 cache: Optional[BusinessCache] = None,
+                 incremental: bool = False,
+                 profiler: Optional[Profiler] = None):
+        self.pool = pool
+        self.cache = cache
+        self.incremental = incremental
+        self.profiler = profiler
+        self.lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def scrape(self, query: str, max_results: int, normalize: bool = False) -> Iterator[Business]:
+        """Yield the businesses of a query as soon as each is scraped."""
+        with self.lock:
+            self.running += 1
+        ok = False
+        try:
+            with self.pool.scraper(self.cache, self.incremental, None, self.profiler) as scraper:
+                for business in scraper.iter_businesses(query, max_results):
+                    yield normalize_businesses([business])[0] if normalize else business
+            ok = True
+        finally:
+            with self.lock:
+                self.running -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def state(self) -> dict:
+        with self.lock:
+            return {
+                'drivers': self.pool.size,
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'replaced': self.pool.replaced,
+                'recycled': self.pool.recycled,
+                'rate': shared_controller().state()
+            }
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """Local HTTP/JSON API of the daemon.
+
+    GET /health returns the service state. POST /scrape takes
+    {"query": ...} or {"location": ..., "business_type": ...} with optional
+    "max_results" (default 20) and "normalize", and streams one JSON line
+    per business as it is scraped, ending with a line holding "done" and
+    the count, or "error". The response ends when the connection closes.
+    """
+
+    service: ScrapeService = None  # Set by serve()
+
+    def _send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_line(self, data: dict) -> None:
+        self.wfile.write(json.dumps(data).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def do_GET(self) -> None:
+        if self.path != '/health':
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+            return
+        self._send_json(200, self.service.state())
+
+    def do_POST(self) -> None:
+        if self.path != '/scrape':
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            job = json.loads(self.rfile.read(length) or b'{}')
+            query = job.get('query') or f'{job.get("location") or ""} {job.get("business_type") or ""}'.strip()
+            max_results = int(job.get('max_results', 20))
+            normalize = bool(job.get('normalize', False))
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send_json(400, {'error': f'Invalid job: {str(e)}'})
+            return
+        if not all(isinstance(job.get(field) or '', str) for field in ('query', 'location', 'business_type')):
+            self._send_json(400, {'error': 'query, location and business_type must be strings'})
+            return
+        if not query or max_results < 1:
+            self._send_json(400, {'error': 'A job needs a query or location and business_type, and max_results of at least 1'})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+
+        start = time.perf_counter()
+        count = 0
+        businesses = self.service.scrape(query, max_results, normalize)
+        try:
+            for business in businesses:
+                self._write_line({'business': business_to_dict(business)})
+                count += 1
+        except (BrokenPipeError, ConnectionResetError):
+            print_colored(f'{query}: client disconnected after {count} businesses', Colors.YELLOW)
+            return
+        except Exception as e:
+            print_colored(f'{query} failed: {str(e)}', Colors.YELLOW)
+            self._write_line({'error': str(e), 'count': count})
+            return
+        finally:
+            businesses.close()  # Stops scraping early and frees the driver
+        elapsed = time.perf_counter() - start
+        print_colored(f'{query}: {count} businesses in {elapsed:.1f}s', Colors.BLUE)
+        self._write_line({'done': True, 'count': count, 'elapsed': round(elapsed, 3)})
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # Jobs are reported with print_colored instead
+
+def serve(service: ScrapeService, host: str, port: int) -> None:
+    """Serve the API on host:port until interrupted."""
+    handler = type('Handler', (ServiceHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print_colored(f'Serving on http://{host}:{server.server_port} with {service.pool.size} warm drivers', Colors.GREEN)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print_colored('Shutting down', Colors.BLUE)
+    finally:
+        server.server_close()
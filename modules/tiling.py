@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+import math
+import queue
+import threading
+import time
+
+from .pool import DriverPool
+from .batch import WorkerStats
+from .cache import BusinessCache, business_key
+from .checkpoint import Checkpoint
+from .profiler import Profiler
+from .dedup import DedupIndex
+from .helpers import print_colored
+from .const.colors import Colors
+from .const.settings import SCRAPER_CONFIG, Business
+
+@dataclass
+class Tile:
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def viewport(self) -> str:
+        """Maps URL viewport centred on the tile and zoomed to fit its width."""
+        lat = (self.south + self.north) / 2
+        lng = (self.west + self.east) / 2
+        # At zoom z a ~1024px wide map shows about 1440 / 2**z degrees of longitude
+        span = max(self.east - self.west, 1e-6)
+        zoom = min(max(math.floor(math.log2(1440 / span)), 1), 21)
+        return f'@{lat:.6f},{lng:.6f},{zoom}z'
+
+    def subdivide(self) -> List['Tile']:
+        """Split the tile into four quadrants one level deeper."""
+        mid_lat = (self.south + self.north) / 2
+        mid_lng = (self.west + self.east) / 2
+        return [
+            Tile(self.south, self.west, mid_lat, mid_lng, self.depth + 1),
+            Tile(self.south, mid_lng, mid_lat, self.east, self.depth + 1),
+            Tile(mid_lat, self.west, self.north, mid_lng, self.depth + 1),
+            Tile(mid_lat, mid_lng, self.north, self.east, self.depth + 1)
+        ]
+
+def grid_tiles(bbox: Tuple[float, float, float, float], grid: int) -> List[Tile]:
+    """Split a (south, west, north, east) bounding box into grid x grid tiles."""
+    south, west, north, east = bbox
+    lat_step = (north - south) / grid
+    lng_step = (east - west) / grid
+    return [
+        Tile(south + row * lat_step, west + col * lng_step,
+             south + (row + 1) * lat_step, west + (col + 1) * lng_step)
+        for row in range(grid)
+        for col in range(grid)
+    ]
+
+def run_tiled(query: str, bbox: Tuple[float, float, float, float], grid: int, max_results: int,
+              workers: int, pool: DriverPool,
+              cache: Optional[BusinessCache] = None,
+              incremental: bool = False,
+              checkpoint: Optional[Checkpoint] = None,
+              profiler: Optional[Profiler] = None,
+              dedup: Optional[DedupIndex] = None,
+              sink: Optional[Callable[[Business], None]] = None) -> Tuple[List[Business], List[WorkerStats]]:
+    """Scrape a query tile by tile over a driver pool.
+
+    A tile that returns max_results businesses has probably hit the result
+    list cap, so it is split into quadrants that are queued in turn, up to
+    SCRAPER_CONFIG['tile_max_depth'] levels. Businesses found in several
+    overlapping tiles are kept once; with a dedup index they are skipped
+    before their reviews are fetched. With a sink, each business is passed
+    on as soon as it is scraped and the returned list is empty.
+    """
+    pending = queue.Queue()
+    for tile in grid_tiles(bbox, grid):
+        pending.put(tile)
+
+    seen = set()
+    businesses = []
+    duplicates = 0
+    lock = threading.Lock()
+    stats = [WorkerStats(worker_id=i) for i in range(workers)]
+
+    def worker(worker_stats: WorkerStats) -> None:
+        nonlocal duplicates
+        while True:
+            tile = pending.get()
+            if tile is None:
+                break
+
+            start = time.perf_counter()
+            try:
+                with pool.scraper(cache, incremental, checkpoint, profiler, dedup) as scraper:
+                    found = 0
+                    for business in scraper.iter_businesses(query, max_results, tile.viewport):
+                        found += 1
+                        key = business_key(business)
+                        with lock:
+                            if key in seen:
+                                duplicates += 1
+                                continue
+                            seen.add(key)
+                            if not sink:
+                                businesses.append(business)
+                        if sink:
+                            sink(business)
+                worker_stats.businesses += found
+                print_colored(f'[worker {worker_stats.worker_id}] {tile.viewport}: {found} businesses', Colors.BLUE)
+
+                # Cards skipped as duplicates still count towards the cap
+                if found + scraper.last_duplicates >= max_results and tile.depth < SCRAPER_CONFIG['tile_max_depth']:
+                    for subtile in tile.subdivide():
+                        pending.put(subtile)
+            except Exception as e:
+                worker_stats.failed += 1
+                print_colored(f'[worker {worker_stats.worker_id}] {tile.viewport} failed: {str(e)}', Colors.YELLOW)
+            finally:
+                worker_stats.queries += 1
+                worker_stats.elapsed += time.perf_counter() - start
+                pending.task_done()
+
+    threads = [threading.Thread(target=worker, args=(s,), daemon=True) for s in stats]
+    for thread in threads:
+        thread.start()
+
+    # Subdivided tiles are queued before task_done, so join only returns once
+    # no tile is left to scrape; then release the workers
+    pending.join()
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+
+    print_colored(f'Tiles: {len(seen)} unique businesses, {duplicates} duplicates dropped', Colors.CYAN)
+    return businesses, stats
@@ -1,109 +1,160 @@
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from typing import List
 
+from .reviewstore import ReviewStore
 from .const.settings import Business
 
+# Business sheet headers
+BUSINESS_HEADERS = [
+    'Business Name',
+    'Street Address',
+    'Postal Code',
+    'City',
+    'Phone',
+    'Website',
+    'Average Rating',
+    'Number of Reviews'
+]
+
+# Review sheet headers
+REVIEW_HEADERS = [
+    'Business Name',
+    'Review Text',
+    'Rating',
+    'Time Posted',
+    'Positive Points',
+    'Negative Points',
+    'Services Used',
+    'Date Posted'
+]
+
+# Rows buffered per sheet to size columns before streaming starts.
+# Write-only sheets emit column widths ahead of the data, so widths are
+# taken from the running max over this sample rather than every row.
+WIDTH_SAMPLE_ROWS = 100
+
+class _StreamingSheet:
+    """Write-only sheet that sizes columns from a buffered sample of rows."""
+
+    def __init__(self, ws, headers: List[str]):
+        self.ws = ws
+        self.max_lengths = [len(header) for header in headers]
+        self.buffer = [self._header_row(headers)]
+        self.sized = False
+
+    def _header_row(self, headers: List[str]) -> list:
+        row = []
+        for header in headers:
+            cell = WriteOnlyCell(self.ws, value=header)
+            cell.font = Font(bold=True, color='FFFFFF')
+            cell.fill = PatternFill(start_color='4F81BD', end_color='4F81BD', fill_type='solid')
+            cell.alignment = Alignment(horizontal='center')
+            cell.border = Border(
+                left=Side(style='thin'),
+                right=Side(style='thin'),
+                top=Side(style='thin'),
+                bottom=Side(style='thin')
+            )
+            row.append(cell)
+        return row
+
+    def append(self, values: list) -> None:
+        if self.sized:
+            self.ws.append(values)
+            return
+
+        for col, value in enumerate(values):
+            if value is not None and len(str(value)) > self.max_lengths[col]:
+                self.max_lengths[col] = len(str(value))
+        self.buffer.append(values)
+
+        if len(self.buffer) > WIDTH_SAMPLE_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Apply column widths and write out the buffered rows."""
+        if self.sized:
+            return
+
+        for col, max_length in enumerate(self.max_lengths, 1):
+            self.ws.column_dimensions[get_column_letter(col)].width = max_length + 2
+        for values in self.buffer:
+            self.ws.append(values)
+
+        self.buffer = []
+        self.sized = True
+
+class StreamingWorkbook:
+    """Excel writer that streams businesses and reviews as they are produced."""
+
+    extension = 'xlsx'
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self.paths = [output_file]
+        self.wb = Workbook(write_only=True)
+        self.businesses = _StreamingSheet(self.wb.create_sheet('Businesses'), BUSINESS_HEADERS)
+        self.reviews = _StreamingSheet(self.wb.create_sheet('Reviews'), REVIEW_HEADERS)
+
+    def add_business(self, business: Business) -> None:
+        """Write a business row followed by its review rows."""
+        self.businesses.append([
+            business.name,
+            business.street_address,
+            business.postal_code,
+            business.city,
+            business.phone,
+            business.website,
+            business.avg_rating,
+            business.num_ratings
+        ])
+
+        for review in business.reviews:
+            self.reviews.append([
+                business.name,
+                review.text,
+                review.rating,
+                review.time_posted,
+                '\n'.join(review.positive_points) if review.positive_points else '',
+                '\n'.join(review.negative_points) if review.negative_points else '',
+                '\n'.join(review.services_used) if review.services_used else '',
+                review.date_posted
+            ])
+
+    def add_store(self, store: ReviewStore) -> None:
+        """Write every business and review of a store without building Review objects."""
+        for business in store.shells:
+            self.add_business(business)
+
+        for index, text, rating, time_posted, positive, negative, services, date_posted in store.review_rows():
+            self.reviews.append([
+                store.shells[index].name,
+                text,
+                rating,
+                time_posted,
+                '\n'.join(positive) if positive else '',
+                '\n'.join(negative) if negative else '',
+                '\n'.join(services) if services else '',
+                date_posted
+            ])
+
+    def close(self) -> None:
+        """Flush remaining rows and save the workbook."""
+        self.businesses.flush()
+        self.reviews.flush()
+        self.wb.save(self.output_file)
+
+    def __enter__(self) -> 'StreamingWorkbook':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
 def create_workbook(businesses: List[Business], output_file: str) -> None:
     """Create an Excel workbook with business data."""
-    wb = Workbook()
-    
-    # Create main sheet
-    ws_businesses = wb.active
-    ws_businesses.title = 'Businesses'
-    
-    # Create reviews sheet
-    ws_reviews = wb.create_sheet('Reviews')
-    
-    # Style definitions
-    header_font = Font(bold=True, color='FFFFFF')
-    header_fill = PatternFill(start_color='4F81BD', end_color='4F81BD', fill_type='solid')
-    centered = Alignment(horizontal='center')
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Business sheet headers
-    business_headers = [
-        'Business Name',
-        'Street Address',
-        'Postal Code',
-        'City',
-        'Phone',
-        'Website',
-        'Average Rating',
-        'Number of Reviews'
-    ]
-    
-    # Review sheet headers
-    review_headers = [
-        'Business Name',
-        'Review Text',
-        'Rating',
-        'Time Posted',
-        'Positive Points',
-        'Negative Points',
-        'Services Used'
-    ]
-    
-    # Setup business sheet
-    for col, header in enumerate(business_headers, 1):
-        cell = ws_businesses.cell(row=1, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = centered
-        cell.border = border
-    
-    # Setup review sheet
-    for col, header in enumerate(review_headers, 1):
-        cell = ws_reviews.cell(row=1, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = centered
-        cell.border = border
-    
-    # Fill business data
-    for row, business in enumerate(businesses, 2):
-        ws_businesses.cell(row=row, column=1).value = business.name
-        ws_businesses.cell(row=row, column=2).value = business.street_address
-        ws_businesses.cell(row=row, column=3).value = business.postal_code
-        ws_businesses.cell(row=row, column=4).value = business.city
-        ws_businesses.cell(row=row, column=5).value = business.phone
-        ws_businesses.cell(row=row, column=6).value = business.website
-        ws_businesses.cell(row=row, column=7).value = business.avg_rating
-        ws_businesses.cell(row=row, column=8).value = business.num_ratings
-    
-    # Fill review data
-    review_row = 2
-    for business in businesses:
-        for review in business.reviews:
-            ws_reviews.cell(row=review_row, column=1).value = business.name
-            ws_reviews.cell(row=review_row, column=2).value = review.text
-            ws_reviews.cell(row=review_row, column=3).value = review.rating
-            ws_reviews.cell(row=review_row, column=4).value = review.time_posted
-            ws_reviews.cell(row=review_row, column=5).value = '\n'.join(review.positive_points) if review.positive_points else ''
-            ws_reviews.cell(row=review_row, column=6).value = '\n'.join(review.negative_points) if review.negative_points else ''
-            ws_reviews.cell(row=review_row, column=7).value = '\n'.join(review.services_used) if review.services_used else ''
-            review_row += 1
-    
-    # Auto-adjust column widths
-    for ws in [ws_businesses, ws_reviews]:
-        for col in ws.columns:
-            max_length = 0
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[get_column_letter(col[0].column)].width = adjusted_width
-    
-    # Save workbook
-    wb.save(output_file)
\ No newline at end of file
+    with StreamingWorkbook(output_file) as wb:
+        for business in businesses:
+            wb.add_business(business)
@@ -0,0 +1,125 @@
+from typing import Callable, Dict, List, Optional
+import os
+import socket
+import threading
+import time
+
+from .pool import DriverPool
+from .batch import WorkerStats
+from .jobqueue import Job, JobQueue
+from .cache import BusinessCache
+from .profiler import Profiler
+from .dedup import DedupIndex
+from .helpers import print_colored
+from .const.colors import Colors
+from .const.settings import SCRAPER_CONFIG, Business
+
+def run_worker(job_queue: JobQueue, pool: DriverPool, workers: int,
+               cache: Optional[BusinessCache] = None,
+               incremental: bool = False,
+               profiler: Optional[Profiler] = None,
+               dedup: Optional[DedupIndex] = None) -> List[WorkerStats]:
+    """Scrape jobs leased from a shared queue until no job is pending or leased.
+
+    Runs one thread per pooled driver, like run_batch, but the jobs come
+    from the queue and each job's businesses are pushed back to it once the
+    job is done. A heartbeat thread renews the leases of running jobs, so a
+    job only moves to another worker when this one dies or stalls.
+    """
+    name = f'{socket.gethostname()}-{os.getpid()}'
+    held: Dict[str, Job] = {}  # Worker name -> leased job
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def heartbeat() -> None:
+        while not stopped.wait(SCRAPER_CONFIG['job_heartbeat']):
+            with lock:
+                leases = list(held.items())
+            for worker_name, job in leases:
+                try:
+                    if not job_queue.heartbeat(job, worker_name, SCRAPER_CONFIG['job_lease']):
+                        print_colored(f'[{worker_name}] lost the lease on {job.query}', Colors.YELLOW)
+                except Exception as e:
+                    print_colored(f'[{worker_name}] heartbeat failed: {str(e)}', Colors.YELLOW)
+
+    stats = [WorkerStats(worker_id=i) for i in range(workers)]
+
+    def worker(worker_stats: WorkerStats) -> None:
+        worker_name = f'{name}-{worker_stats.worker_id}'
+        while True:
+            job = job_queue.lease(worker_name, SCRAPER_CONFIG['job_lease'])
+            if job is None:
+                if job_queue.drained():
+                    break
+                # Jobs leased elsewhere may still come back
+                time.sleep(SCRAPER_CONFIG['job_poll_interval'])
+                continue
+
+            with lock:
+                held[worker_name] = job
+            start = time.perf_counter()
+            try:
+                with pool.scraper(cache, incremental, None, profiler, dedup) as scraper:
+                    businesses = scraper.scrape_businesses(job.query, job.max_results)
+                if job_queue.complete(job, worker_name, businesses):
+                    worker_stats.businesses += len(businesses)
+                    print_colored(f'[{worker_name}] {job.query}: {len(businesses)} businesses', Colors.BLUE)
+                else:
+                    print_colored(f'[{worker_name}] {job.query}: lease expired, results dropped', Colors.YELLOW)
+            except Exception as e:
+                worker_stats.failed += 1
+                print_colored(f'[{worker_name}] {job.query} failed (attempt {job.attempts}): {str(e)}', Colors.YELLOW)
+                job_queue.fail(job, worker_name, str(e))
+            finally:
+                with lock:
+                    held.pop(worker_name, None)
+                worker_stats.queries += 1
+                worker_stats.elapsed += time.perf_counter() - start
+
+    beat = threading.Thread(target=heartbeat, daemon=True)
+    beat.start()
+    threads = [threading.Thread(target=worker, args=(s,), daemon=True) for s in stats]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stopped.set()
+    beat.join()
+
+    return stats
+
+def collect_results(job_queue: JobQueue, sink: Callable[[Business], None]) -> int:
+    """Pass businesses pushed to the queue to sink until every job is done or failed.
+
+    Expired leases are requeued on the way, so jobs of a dead worker go
+    back to the queue even while no other worker is asking for jobs.
+    Returns the number of businesses collected.
+    """
+    position = 0
+    collected = 0
+    last_counts = None
+    while True:
+        drained = job_queue.drained()
+        position, businesses = job_queue.read_results(position)
+        for business in businesses:
+            sink(business)
+        collected += len(businesses)
+
+        counts = job_queue.counts()
+        if counts != last_counts:
+            print_colored(
+                f'Jobs: {counts["done"]} done, {counts["leased"]} running, '
+                f'{counts["pending"]} pending, {counts["failed"]} failed',
+                Colors.BLUE
+            )
+            last_counts = counts
+        # Drained was checked before reading, so results of the last job are in
+        if drained:
+            break
+
+        job_queue.requeue_expired()
+        time.sleep(SCRAPER_CONFIG['job_poll_interval'])
+
+    for query, error in job_queue.failures():
+        print_colored(f'Job failed: {query}: {error}', Colors.YELLOW)
+    return collected
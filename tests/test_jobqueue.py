@@ -0,0 +1,95 @@
+import pytest
+
+from modules.const.settings import SCRAPER_CONFIG, Business, Review
+from modules.jobqueue import RedisJobQueue, SqliteJobQueue
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def job_queue(request, tmp_path):
+    if request.param == 'sqlite':
+        queue = SqliteJobQueue(str(tmp_path / 'jobs.db'))
+    else:
+        fakeredis = pytest.importorskip('fakeredis')
+        queue = RedisJobQueue(fakeredis.FakeRedis(decode_responses=True))
+    yield queue
+    queue.close()
+
+def business(name: str) -> Business:
+    review = Review(text='Tidy work', rating=5.0, time_posted='a week ago', review_id='r1')
+    return Business(name, 'Hauptstraße 1', '91522', 'Ansbach', None, None, 4.5, 10, [review])
+
+def test_put_adds_each_job_once(job_queue):
+    assert job_queue.put([('Berlin', 'hotel', 10), ('Ansbach', 'electrician', 5)]) == 2
+    assert job_queue.put([('Berlin', 'hotel', 10), ('Berlin', 'hotel', 20)]) == 1
+    assert job_queue.counts() == {'pending': 3, 'leased': 0, 'done': 0, 'failed': 0}
+
+def test_jobs_are_leased_in_order_and_once(job_queue):
+    job_queue.put([('Berlin', 'hotel', 10), ('Ansbach', 'electrician', 5)])
+
+    first = job_queue.lease('a', 60)
+    second = job_queue.lease('b', 60)
+    assert (first.query, first.max_results, first.attempts) == ('Berlin hotel', 10, 1)
+    assert second.query == 'Ansbach electrician'
+    assert job_queue.lease('c', 60) is None
+    assert job_queue.counts()['leased'] == 2 and not job_queue.drained()
+
+def test_expired_lease_is_reclaimed_by_another_worker(job_queue):
+    job_queue.put([('Berlin', 'hotel', 10)])
+    stale = job_queue.lease('a', -1)
+
+    job = job_queue.lease('b', 60)
+    assert job.id == stale.id and job.attempts == 2
+    # The worker that lost the lease can neither renew nor deliver it
+    assert not job_queue.heartbeat(stale, 'a', 60)
+    assert not job_queue.complete(stale, 'a', [business('Stale')])
+    assert job_queue.heartbeat(job, 'b', 60)
+
+def test_only_the_lease_holder_completes_a_job(job_queue):
+    job_queue.put([('Berlin', 'hotel', 10)])
+    job = job_queue.lease('a', 60)
+
+    assert not job_queue.complete(job, 'b', [business('Wrong')])
+    job_queue.fail(job, 'b', 'Not mine')
+    assert job_queue.counts()['leased'] == 1
+
+    assert job_queue.complete(job, 'a', [business('Hotel Adlon')])
+    assert job_queue.counts() == {'pending': 0, 'leased': 0, 'done': 1, 'failed': 0}
+    assert job_queue.drained()
+
+def test_failed_job_is_retried_until_attempts_run_out(job_queue, monkeypatch):
+    monkeypatch.setitem(SCRAPER_CONFIG, 'job_max_attempts', 2)
+    job_queue.put([('Berlin', 'hotel', 10)])
+
+    job = job_queue.lease('a', 60)
+    job_queue.fail(job, 'a', 'Search timed out')
+    assert job_queue.counts()['pending'] == 1
+
+    job = job_queue.lease('a', 60)
+    assert job.attempts == 2
+    job_queue.fail(job, 'a', 'Captcha page')
+    assert job_queue.counts() == {'pending': 0, 'leased': 0, 'done': 0, 'failed': 1}
+    assert job_queue.failures() == [('Berlin hotel', 'Captcha page')]
+    assert job_queue.lease('a', 60) is None
+
+def test_expired_lease_fails_the_job_after_the_last_attempt(job_queue, monkeypatch):
+    monkeypatch.setitem(SCRAPER_CONFIG, 'job_max_attempts', 1)
+    job_queue.put([('Berlin', 'hotel', 10)])
+    job_queue.lease('a', -1)
+
+    assert job_queue.requeue_expired() == 1
+    assert job_queue.failures() == [('Berlin hotel', 'Lease expired')]
+    assert job_queue.drained()
+
+def test_results_are_read_from_a_position(job_queue):
+    job_queue.put([('Berlin', 'hotel', 10), ('Ansbach', 'electrician', 5)])
+    first = job_queue.lease('a', 60)
+    second = job_queue.lease('a', 60)
+
+    job_queue.complete(first, 'a', [business('Hotel Adlon'), business('Hotel Bristol')])
+    position, businesses = job_queue.read_results()
+    assert [b.name for b in businesses] == ['Hotel Adlon', 'Hotel Bristol']
+    assert businesses[0].reviews[0].review_id == 'r1'
+
+    assert job_queue.read_results(position) == (position, [])
+    job_queue.complete(second, 'a', [business('Elektro Meier')])
+    position, businesses = job_queue.read_results(position)
+    assert [b.name for b in businesses] == ['Elektro Meier']
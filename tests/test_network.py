@@ -0,0 +1,109 @@
+import json
+import os
+
+import pytest
+
+from modules.network import ResponseCapture, decode_response, parse_reviews_response, parse_search_response
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+def test_decode_response_unwraps_guard_and_payload():
+    assert decode_response(')]}\'\n[1, 2]') == [1, 2]
+    assert decode_response(json.dumps({'c': 0, 'd': ')]}\'\n[3]'}) + '/*""*/') == [3]
+
+def test_parse_search_response():
+    businesses = parse_search_response(fixture('search_response.txt'))
+
+    # The header entry, the place without an address and the unparsable address are skipped
+    assert [b.name for b in businesses] == ['Elektro Meier', 'Schmidt Elektrotechnik']
+    meier, schmidt = businesses
+    assert (meier.street_address, meier.postal_code, meier.city) == ('Hauptstraße 1', '91522', 'Ansbach')
+    assert meier.phone == '0981 12345'
+    assert meier.website == 'https://meier.example/'
+    assert (meier.avg_rating, meier.num_ratings) == (4.6, 87)
+    assert schmidt.phone is None and schmidt.website is None
+    assert (schmidt.avg_rating, schmidt.num_ratings) == (4.1, 12)
+
+def test_parse_reviews_response():
+    reviews = parse_reviews_response(fixture('reviews_response.txt'))
+
+    # The entry without a rating is skipped
+    assert [(r.text, r.rating, r.time_posted) for r in reviews] == [
+        ('Quick response and tidy work.', 5.0, '2 weeks ago'),
+        ('Fair price, but arrived late.', 3.0, 'a month ago'),
+        ('Sehr zuverlässig!', 4.0, 'vor 3 Monaten')
+    ]
+    assert [r.review_id for r in reviews] == [
+        'ChZDSUhNMG9nS0VJQ0FnSUNqMnVLY1NREAE', None, 'ChdDSUhNMG9nS0VJQ0FnSUNqMnRHMzFRRRAB'
+    ]
+
+@pytest.mark.parametrize('body', ['', ')]}\'\n[1, 2', '<html>Error</html>'])
+def test_malformed_body_raises(body):
+    with pytest.raises(ValueError):
+        parse_search_response(body)
+    with pytest.raises(ValueError):
+        parse_reviews_response(body)
+
+def test_unexpected_structure_parses_to_nothing():
+    assert parse_search_response(')]}\'\n{"unexpected": true}') == []
+    assert parse_reviews_response(')]}\'\n[null, null, 7]') == []
+
+class FakeDriver:
+    """Performance log and response bodies as Chrome would hand them out."""
+
+    def __init__(self, bodies: dict):
+        self.bodies = bodies
+        self.log = []
+
+    def event(self, method: str, **params) -> None:
+        self.log.append({'message': json.dumps({'message': {'method': method, 'params': params}})})
+
+    def response(self, request_id: str, url: str, finished: bool = True) -> None:
+        self.event('Network.responseReceived', requestId=request_id, response={'url': url})
+        if finished:
+            self.event('Network.loadingFinished', requestId=request_id)
+
+    def get_log(self, kind: str) -> list:
+        log, self.log = self.log, []
+        return log
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        return {'body': self.bodies[params['requestId']]}
+
+REVIEWS_URL = 'https://www.google.com/maps/rpc/listugcposts?authuser=0'
+SEARCH_URL = 'https://www.google.com/search?tbm=map&q=electrician'
+
+def test_capture_falls_back_on_malformed_body():
+    driver = FakeDriver({'1': '<html>Error</html>', '2': fixture('reviews_response.txt')})
+    capture = ResponseCapture(driver)
+    driver.response('1', SEARCH_URL)
+    driver.response('2', REVIEWS_URL)
+
+    # A body that does not parse yields nothing, so the caller uses the page instead
+    assert capture.businesses() == []
+    assert len(capture.reviews()) == 3
+
+def test_capture_waits_for_loading_finished():
+    driver = FakeDriver({'1': fixture('reviews_response.txt')})
+    capture = ResponseCapture(driver)
+    driver.response('1', REVIEWS_URL, finished=False)
+    assert capture.reviews() == []
+
+    driver.event('Network.loadingFinished', requestId='1')
+    assert len(capture.reviews()) == 3
+
+def test_capture_begin_drops_responses_of_earlier_clicks():
+    driver = FakeDriver({'1': fixture('reviews_response.txt'), '2': ')]}\'\n[null, null, []]'})
+    capture = ResponseCapture(driver)
+
+    # The first card's response is still loading when the next card is opened
+    driver.response('1', REVIEWS_URL, finished=False)
+    capture.begin('reviews')
+    driver.event('Network.loadingFinished', requestId='1')
+    driver.response('2', REVIEWS_URL)
+
+    assert capture.reviews() == []
@@ -0,0 +1,50 @@
+from selenium.common.exceptions import NoSuchElementException
+
+from modules.const.settings import SCRAPER_CONFIG
+from modules.pool import DriverPool
+
+class FakeDriver:
+    def __init__(self, slot: int):
+        self.slot_launched = slot
+        self.alive = True
+
+    def get(self, url: str) -> None:
+        pass
+
+    def set_script_timeout(self, timeout: float) -> None:
+        pass
+
+    def find_element(self, *args):
+        raise NoSuchElementException()
+
+    def execute_script(self, script: str, *args):
+        if not self.alive:
+            raise Exception('Session gone')
+        return 1 if script == 'return 1;' else 0
+
+    def quit(self) -> None:
+        self.alive = False
+
+def test_replacements_reuse_their_slot(monkeypatch):
+    monkeypatch.setitem(SCRAPER_CONFIG, 'driver_max_queries', 1)
+    launched = []
+
+    def factory(slot: int) -> FakeDriver:
+        launched.append(slot)
+        return FakeDriver(slot)
+
+    with DriverPool(factory, 2) as pool:
+        assert sorted(launched) == [0, 1]
+
+        # Recycled after driver_max_queries queries
+        driver = pool.acquire()
+        slot = driver.slot_launched
+        pool.release(driver)
+        assert launched[2:] == [slot] and not driver.alive
+
+        # Replaced after a crash
+        driver = pool.acquire()
+        driver.alive = False
+        replacement = pool.recover(driver)
+        assert launched[3:] == [driver.slot_launched] and replacement.slot_launched == driver.slot_launched
+        assert pool.replaced == 1 and pool.recycled == 1
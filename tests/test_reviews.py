@@ -0,0 +1,42 @@
+from modules.const.settings import Review
+from modules.scraper import GoogleMapsScraper
+
+# Neither helper touches the driver
+scraper = GoogleMapsScraper.__new__(GoogleMapsScraper)
+
+def review(rating: float, text: str = '', review_id: str = None) -> Review:
+    return Review(text=text, rating=rating, time_posted='a week ago', review_id=review_id)
+
+def test_merge_keeps_stored_reviews_that_only_look_alike():
+    stored = [review(5.0), review(5.0), review(4.0, 'Sehr gut')]
+    merged = scraper._merge_reviews([review(5.0)], stored)
+
+    # The new review may be one of the stored ones, but not both
+    assert [(r.rating, r.text) for r in merged] == [(5.0, ''), (5.0, ''), (4.0, 'Sehr gut')]
+
+def test_merge_matches_by_review_id():
+    stored = [review(5.0, review_id='b'), review(5.0, review_id='a')]
+    merged = scraper._merge_reviews([review(5.0, review_id='c'), review(5.0, review_id='b')], stored)
+
+    assert [r.review_id for r in merged] == ['c', 'b', 'a']
+
+def test_merge_matches_reviews_stored_without_ids_by_content():
+    stored = [review(3.0, 'Late'), review(5.0, 'Tidy')]
+    merged = scraper._merge_reviews([review(4.0, 'New', 'n'), review(3.0, 'Late', 'l')], stored)
+
+    assert [(r.text, r.review_id) for r in merged] == [('New', 'n'), ('Late', 'l'), ('Tidy', None)]
+
+def test_stored_start_by_review_id():
+    stored = [review(5.0, review_id='a'), review(4.0, review_id='b')]
+    fetched = [review(5.0, review_id='x'), review(5.0, review_id='a'), review(4.0, review_id='b')]
+
+    assert scraper._stored_start(fetched, stored) == 1
+    assert scraper._stored_start(fetched[:1], stored) is None
+
+def test_stored_start_needs_a_run_without_ids():
+    stored = [review(5.0), review(4.0, 'Fair'), review(5.0, 'Tidy'), review(3.0)]
+    # A new review that looks like the newest stored one is no boundary
+    fetched = [review(5.0), review(5.0), review(4.0, 'Fair'), review(5.0, 'Tidy')]
+
+    assert scraper._stored_start(fetched, stored) == 1
+    assert scraper._stored_start(fetched[:3], stored) is None